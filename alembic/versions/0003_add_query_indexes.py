@@ -0,0 +1,27 @@
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0003_add_query_indexes'
+down_revision = '0002_create_tables'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Game history (moves of one game in turn order) and per-player move lookups
+    op.create_index('ix_moves_game_id_turn_index', 'moves', ['game_id', 'turn_index'])
+    op.create_index('ix_moves_player_id_game_id', 'moves', ['player_id', 'game_id'])
+
+    # Finished-game listings and leaderboards
+    op.create_index('ix_games_ended_at', 'games', ['ended_at'])
+    op.create_index('ix_games_winner_player_id_ended_at', 'games', ['winner_player_id', 'ended_at'])
+
+    op.create_index('ix_game_players_game_id_player_id', 'game_players', ['game_id', 'player_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_game_players_game_id_player_id', table_name='game_players')
+    op.drop_index('ix_games_winner_player_id_ended_at', table_name='games')
+    op.drop_index('ix_games_ended_at', table_name='games')
+    op.drop_index('ix_moves_player_id_game_id', table_name='moves')
+    op.drop_index('ix_moves_game_id_turn_index', table_name='moves')
@@ -0,0 +1,25 @@
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0004_create_game_snapshots'
+down_revision = '0003_add_query_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'game_snapshots',
+        sa.Column('id', sa.Integer, primary_key=True),
+        sa.Column('game_id', sa.Integer, sa.ForeignKey('games.id'), nullable=False),
+        sa.Column('turn_index', sa.Integer, nullable=False),
+        sa.Column('state', sa.LargeBinary(32), nullable=False),
+        sa.Column('created_at', sa.DateTime, nullable=False),
+    )
+    op.create_index('ix_game_snapshots_game_id_turn_index', 'game_snapshots', ['game_id', 'turn_index'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_game_snapshots_game_id_turn_index', table_name='game_snapshots')
+    op.drop_table('game_snapshots')
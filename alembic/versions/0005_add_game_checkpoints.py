@@ -0,0 +1,21 @@
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0005_add_game_checkpoints'
+down_revision = '0004_create_game_snapshots'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Latest completed turn of a live game, rewritten every turn so resuming survives a crash
+    with op.batch_alter_table('games') as batch:
+        batch.add_column(sa.Column('checkpoint_turn', sa.Integer, nullable=True))
+        batch.add_column(sa.Column('checkpoint_state', sa.LargeBinary(32), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('games') as batch:
+        batch.drop_column('checkpoint_state')
+        batch.drop_column('checkpoint_turn')
@@ -0,0 +1,80 @@
+"""Startup regression check for the headless entry points, using ``-X importtime``.
+
+Each case starts a fresh interpreter with ``-X importtime``. The case fails if
+a module it must not load shows up in the trace (rendering, database or
+multiprocessing code on a path that does not use it), or if the median over
+``--runs`` runs of the time spent importing modules a bare interpreter does
+not load is over budget. Exits non-zero on any failure, so it can gate a commit:
+
+    python benchmarks/import_time.py --runs 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LUDO = os.path.join(ROOT, "ludo.py")
+
+DB = ("sqlalchemy", "dotenv", "ludo_cli.db", "ludo_cli.models", "ludo_cli.persistence")
+RENDERING = ("rich",)
+POOLS = ("multiprocessing", "concurrent.futures.process")
+
+# name, interpreter arguments, forbidden module prefixes
+CASES = (
+    ("import ludo", ["-c", "import ludo"], DB + RENDERING + POOLS),
+    ("import engine", ["-c", "import ludo_cli.engine"], DB + RENDERING + POOLS),
+    ("simulate --workers 1", [LUDO, "simulate", "--games", "5", "--workers", "1", "--seed", "1"],
+     DB + RENDERING + POOLS),
+    ("simulate --move-log", [LUDO, "simulate", "--games", "5", "--workers", "1", "--seed", "1",
+                             "--move-log", os.devnull], DB + RENDERING),
+)
+
+
+def trace(args: list[str]) -> list[tuple[str, int, bool]]:
+    """(module, cumulative microseconds, imported at top level) for one fresh interpreter."""
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    result = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=ROOT, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules.append((name.strip(), int(cumulative), not name[1:].startswith(" ")))
+    return modules
+
+
+def import_time(modules: list, baseline: set[str]) -> float:
+    """Milliseconds spent importing top-level modules a bare interpreter does not load."""
+    return sum(cumulative for name, cumulative, top in modules if top and name not in baseline) / 1000
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="interpreters per case (the median is reported)")
+    parser.add_argument("--budget-ms", type=float, default=100.0, help="maximum median import time per case")
+    args = parser.parse_args(argv)
+
+    # Whatever the interpreter loads by itself (site, encodings, ...) is not ours to budget
+    baseline = {name for name, _, _ in trace(["-c", "pass"])}
+    failures = 0
+    print(f"{'Case':<24} {'Import (ms)':>12}  Result")
+    for name, case_args, forbidden in CASES:
+        runs = [trace(case_args) for _ in range(args.runs)]
+        median = statistics.median(import_time(modules, baseline) for modules in runs)
+        loaded = sorted({module for module, _, _ in runs[0]
+                         if any(module == prefix or module.startswith(prefix + ".") for prefix in forbidden)})
+        problems = []
+        if loaded:
+            problems.append("imports " + ", ".join(loaded[:5]) + (" ..." if len(loaded) > 5 else ""))
+        if median > args.budget_ms:
+            problems.append(f"over the {args.budget_ms:.0f} ms budget")
+        failures += bool(problems)
+        print(f"{name:<24} {median:>12.1f}  {'; '.join(problems) or 'ok'}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
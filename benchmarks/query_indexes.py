@@ -0,0 +1,130 @@
+"""Time history and leaderboard queries with and without the 0003 indexes.
+
+Builds a throwaway SQLite database from the ORM metadata, fills it with
+synthetic games, drops the secondary indexes, times each query, recreates
+the indexes and times them again:
+
+    python benchmarks/query_indexes.py --games 20000 --moves-per-game 100
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, desc, func, insert, select  # noqa: E402
+
+from ludo_cli.db import Base  # noqa: E402
+from ludo_cli.models import Game, GamePlayer, Move, Player  # noqa: E402
+
+
+def populate(engine, games: int, moves_per_game: int, seed: int) -> None:
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(Player), [
+            {"id": i + 1, "name": f"Player {i + 1}", "color": c}
+            for i, c in enumerate(("Red", "Blue", "Green", "Yellow"))
+        ])
+        conn.execute(insert(Game), [
+            {
+                "id": g,
+                "started_at": start + timedelta(minutes=g),
+                "ended_at": start + timedelta(minutes=g + 30),
+                "winner_player_id": rng.randint(1, 4),
+            }
+            for g in range(1, games + 1)
+        ])
+        conn.execute(insert(GamePlayer), [
+            {"game_id": g, "player_id": p} for g in range(1, games + 1) for p in range(1, 5)
+        ])
+        batch = []
+        for g in range(1, games + 1):
+            for turn in range(moves_per_game):
+                batch.append({
+                    "game_id": g,
+                    "player_id": turn % 4 + 1,
+                    "turn_index": turn,
+                    "dice": rng.randint(1, 6),
+                    "token_index": rng.randint(1, 4),
+                    "old_pos": rng.randint(0, 56),
+                    "new_pos": rng.randint(1, 57),
+                    "created_at": start,
+                })
+            if len(batch) >= 50_000:
+                conn.execute(insert(Move), batch)
+                batch.clear()
+        if batch:
+            conn.execute(insert(Move), batch)
+
+
+def queries(games: int):
+    cutoff = datetime(2025, 1, 1) + timedelta(minutes=games - 500)
+    return {
+        "game history": lambda g: select(Move).where(Move.game_id == g).order_by(Move.turn_index),
+        "player moves in game": lambda g: select(Move).where(Move.player_id == 2, Move.game_id == g),
+        "leaderboard": lambda g: (
+            select(Game.winner_player_id, func.count())
+            .where(Game.ended_at.is_not(None))
+            .group_by(Game.winner_player_id)
+            .order_by(desc(func.count()))
+        ),
+        "recent finished games": lambda g: (
+            select(Game).where(Game.ended_at >= cutoff).order_by(Game.ended_at.desc()).limit(20)
+        ),
+        "game roster lookup": lambda g: select(GamePlayer.game_id).where(GamePlayer.game_id == g, GamePlayer.player_id == 3),
+    }
+
+
+def time_queries(engine, games: int, repeat: int, seed: int) -> dict[str, float]:
+    rng = random.Random(seed)
+    results = {}
+    with engine.connect() as conn:
+        for name, build in queries(games).items():
+            ids = [rng.randint(1, games) for _ in range(repeat)]
+            started = time.perf_counter()
+            for g in ids:
+                conn.execute(build(g)).fetchall()
+            results[name] = (time.perf_counter() - started) / repeat * 1000
+    return results
+
+
+def secondary_indexes():
+    return [index for table in Base.metadata.sorted_tables for index in table.indexes]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=20_000)
+    parser.add_argument("--moves-per-game", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=50, help="executions per query")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{tmp}/bench.db")
+        Base.metadata.create_all(engine)
+        for index in secondary_indexes():
+            index.drop(engine)
+        populate(engine, args.games, args.moves_per_game, args.seed)
+
+        before = time_queries(engine, args.games, args.repeat, args.seed)
+        for index in secondary_indexes():
+            index.create(engine)
+        with engine.begin() as conn:
+            conn.exec_driver_sql("ANALYZE")
+        after = time_queries(engine, args.games, args.repeat, args.seed)
+        engine.dispose()
+
+    print(f"{args.games} games, {args.games * args.moves_per_game} moves, mean of {args.repeat} runs")
+    print(f"{'query':<24} {'no index (ms)':>14} {'indexed (ms)':>13} {'speedup':>8}")
+    for name in before:
+        print(f"{name:<24} {before[name]:>14.3f} {after[name]:>13.3f} {before[name] / after[name]:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
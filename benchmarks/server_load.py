@@ -0,0 +1,100 @@
+"""Load-test ``ludo.py serve``: many clients, each playing one human seat.
+
+Starts a server in a subprocess on a Unix socket, opens ``--clients``
+connections that each create a table with three bot seats and play their
+own seat as fast as the server answers, and reports request latency
+(request sent -> reply received) and game throughput:
+
+    python benchmarks/server_load.py --clients 1000 --games 2
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def play(path: str, games: int, bots: str, latencies: list, rng: random.Random) -> int:
+    reader, writer = await asyncio.open_unix_connection(path, limit=1 << 20)
+
+    async def request(message: dict) -> None:
+        writer.write(json.dumps(message).encode() + b"\n")
+        await writer.drain()
+
+    finished = 0
+    for _ in range(games):
+        await request({"op": "create", "seats": f"human,{bots}"})
+        game = seat = None
+        sent = 0.0
+        while True:
+            event = json.loads(await reader.readline())
+            kind = event["event"]
+            if kind == "created":
+                game = event["game"]
+            elif kind == "joined":
+                seat = event["seat"]
+            elif kind == "turn" and event["seat"] == seat:
+                sent = time.perf_counter()
+                await request({"op": "roll", "game": game})
+            elif kind == "rolled" and event["seat"] == seat:
+                latencies.append(time.perf_counter() - sent)
+                if len(event["tokens"]) > 1:
+                    sent = time.perf_counter()
+                    await request({"op": "move", "game": game, "token": rng.choice(event["tokens"])})
+            elif kind == "moved" and event["seat"] == seat and sent:
+                latencies.append(time.perf_counter() - sent)
+                sent = 0.0
+            elif kind == "won":
+                finished += 1
+                break
+            elif kind == "error":
+                raise RuntimeError(event["message"])
+    writer.close()
+    return finished
+
+
+async def main_async(args) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "ludo.sock")
+        server = await asyncio.create_subprocess_exec(
+            sys.executable, os.path.join(ROOT, "ludo.py"), "serve", "--unix", path,
+            stdout=asyncio.subprocess.DEVNULL,
+        )
+        try:
+            while not os.path.exists(path):
+                await asyncio.sleep(0.05)
+            latencies: list[float] = []
+            started = time.perf_counter()
+            results = await asyncio.gather(*(
+                play(path, args.games, args.bots, latencies, random.Random(index))
+                for index in range(args.clients)
+            ))
+            elapsed = time.perf_counter() - started
+        finally:
+            server.terminate()
+            await server.wait()
+
+    latencies.sort()
+
+    def ms(q: float) -> float:
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+
+    print(f"{args.clients} clients, {sum(results)} games in {elapsed:.1f}s ({sum(results) / elapsed:,.0f} games/sec)")
+    print(f"{len(latencies):,} requests: p50 {ms(0.50):.2f} ms, p99 {ms(0.99):.2f} ms, max {ms(1.0):.2f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=200, help="concurrent connections (one table each)")
+    parser.add_argument("--games", type=int, default=1, help="games per client, played one after another")
+    parser.add_argument("--bots", default="greedy,greedy,greedy", help="policies for the three bot seats")
+    asyncio.run(main_async(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+"""Throughput benchmarks for the engine, rendering and persistence hot paths.
+
+Every case times a fixed, seeded workload ``--repeat`` times and reports the
+median and best time per operation. Results can be written as JSON and
+compared with an earlier run, so a change to the rules, the renderer or the
+database layer shows up as a number rather than a feeling:
+
+    python benchmarks/suite.py --output before.json
+    python benchmarks/suite.py --compare before.json --output after.json
+    python benchmarks/suite.py --filter engine --quick
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from ludo_cli.engine import (  # noqa: E402
+    NUM_PLAYERS,
+    GameState,
+    apply_move,
+    calculate_new_position,
+    capture_token,
+    check_winner,
+    end_turn,
+    get_movable_tokens,
+    legal_moves,
+    register_roll,
+)
+from ludo_cli.policies import make_policy  # noqa: E402
+from ludo_cli.simulate import play_game  # noqa: E402
+
+SEED = 2024
+
+
+def sample_positions(count: int, seed: int = SEED) -> list[tuple[GameState, int]]:
+    """(state, dice) pairs met in random games, taken after each roll."""
+    rng = random.Random(seed)
+    state = GameState()
+    positions = []
+    while len(positions) < count:
+        dice = register_roll(state, rng.randint(1, 6))
+        positions.append((state.copy(), dice))
+        moves = legal_moves(state, dice)
+        if moves:
+            move = rng.choice(moves)
+            apply_move(state, move)
+            if check_winner(state, move.player):
+                state = GameState()
+                continue
+        end_turn(state, dice, bool(moves))
+    return positions
+
+
+def game_states(seed: int = SEED) -> list[GameState]:
+    """Every position of one random game, in order, as a renderer sees them."""
+    rng = random.Random(seed)
+    state = GameState()
+    states = []
+    while True:
+        dice = register_roll(state, rng.randint(1, 6))
+        moves = legal_moves(state, dice)
+        if moves:
+            move = rng.choice(moves)
+            apply_move(state, move)
+            states.append(state.copy())
+            if check_winner(state, move.player):
+                return states
+        end_turn(state, dice, bool(moves))
+
+
+# -- cases -------------------------------------------------------------------------
+# Each case is ``setup(scale) -> (run, ops[, prepare])``: ``run()`` does ``ops`` operations
+# and is what gets timed; anything it needs is built by the setup, outside the timing, and
+# ``prepare()``, if given, runs untimed before every repetition.
+
+def engine_get_movable_tokens(scale: float):
+    positions = sample_positions(int(20_000 * scale))
+
+    def run():
+        for state, dice in positions:
+            get_movable_tokens(state, state.current, dice)
+    return run, len(positions)
+
+
+def engine_calculate_new_position(scale: float):
+    calls = [(player, pos, dice) for player in range(NUM_PLAYERS) for pos in range(58) for dice in range(1, 7)]
+    calls *= max(1, int(20 * scale))
+
+    def run():
+        for player, pos, dice in calls:
+            calculate_new_position(player, pos, dice)
+    return run, len(calls)
+
+
+def engine_capture_token(scale: float):
+    # Landing squares of real moves, whether or not an opponent stands there
+    targets = []
+    for state, dice in sample_positions(int(20_000 * scale)):
+        for move in legal_moves(state, dice):
+            targets.append((state, move.new_pos, move.player))
+    fresh = []
+
+    def prepare():
+        # capture_token mutates, so every repetition starts from fresh copies
+        fresh[:] = [(state.copy(), position, player) for state, position, player in targets]
+
+    def run():
+        for state, position, player in fresh:
+            capture_token(state, position, player)
+    return run, len(targets), prepare
+
+
+def _games(policy: str, count: int):
+    def setup(scale: float):
+        games = max(1, int(count * scale))
+        rng = random.Random(SEED)
+        policies = [make_policy(policy, random.Random(rng.random())) for _ in range(NUM_PLAYERS)]
+
+        def run():
+            for _ in range(games):
+                play_game(rng, policies)
+        return run, games
+    return setup
+
+
+def _render_to_null():
+    import ludo
+    from rich.console import Console
+
+    ludo.console = Console(file=io.StringIO(), force_terminal=True, color_system="truecolor", width=120)
+    ludo.board_renderer = None
+    return ludo
+
+
+def render_print_board(scale: float):
+    ludo = _render_to_null()
+    states = game_states()[:max(1, int(200 * scale))]
+
+    def run():
+        ludo.console.file.seek(0)
+        ludo.console.file.truncate()
+        for state in states:
+            ludo.print_board(state)
+    return run, len(states)
+
+
+def render_print_game_status(scale: float):
+    ludo = _render_to_null()
+    states = game_states()[:max(1, int(200 * scale))]
+
+    def run():
+        ludo.console.file.seek(0)
+        ludo.console.file.truncate()
+        for state in states:
+            ludo.print_game_status(state)
+    return run, len(states)
+
+
+_scratch = tempfile.TemporaryDirectory(prefix="ludo-bench-")  # removed at exit
+
+
+def _database():
+    """Session factory for a fresh SQLite file with every table created."""
+    from ludo_cli.db import Base, get_engine, get_session_factory
+    from ludo_cli import models  # noqa: F401  (registers the tables)
+
+    url = f"sqlite:///{tempfile.mkdtemp(dir=_scratch.name)}/bench.db"
+    Base.metadata.create_all(get_engine(url))
+    return get_session_factory(url)
+
+
+def _recorded_moves(count: int) -> list[tuple]:
+    return [(index % NUM_PLAYERS, index, 1 + index % 6, 1 + index % 4, index % 52, (index + 3) % 52)
+            for index in range(count)]
+
+
+def persist_orm_commit_per_move(scale: float):
+    from ludo_cli.models import Game, Move
+    from ludo_cli.persistence import ensure_players
+
+    session = _database()()
+    player_ids = ensure_players(session)
+    moves = _recorded_moves(max(1, int(300 * scale)))
+
+    def run():
+        game = Game(started_at=datetime.utcnow())
+        session.add(game)
+        session.commit()
+        for seat, turn, dice, token, old, new in moves:
+            session.add(Move(game_id=game.id, player_id=player_ids[seat], turn_index=turn, dice=dice,
+                             token_index=token, old_pos=old, new_pos=new))
+            session.commit()
+    return run, len(moves)
+
+
+def _recorder(name: str):
+    def setup(scale: float):
+        from ludo_cli import persistence
+
+        recorder_class = getattr(persistence, name)
+        session = _database()()
+        moves = _recorded_moves(max(1, int(20_000 * scale)))
+
+        def run():
+            recorder = recorder_class.start(session)
+            for move in moves:
+                recorder.record(*move)
+            recorder.close(winner=0)
+        return run, len(moves)
+    return setup
+
+
+CASES = {
+    "engine.get_movable_tokens": engine_get_movable_tokens,
+    "engine.calculate_new_position": engine_calculate_new_position,
+    "engine.capture_token": engine_capture_token,
+    "game.random": _games("random", 200),
+    "game.greedy": _games("greedy", 100),
+    "game.heuristic": _games("heuristic", 50),
+    "render.print_board": render_print_board,
+    "render.print_game_status": render_print_game_status,
+    "persist.orm_commit_per_move": persist_orm_commit_per_move,
+    "persist.move_recorder": _recorder("MoveRecorder"),
+    "persist.background_recorder": _recorder("BackgroundMoveRecorder"),
+}
+
+
+def measure(setup, scale: float, repeat: int) -> dict:
+    run, ops, *prepare = setup(scale)
+    times = []
+    for _ in range(repeat):
+        if prepare:
+            prepare[0]()
+        started = time.perf_counter()
+        run()
+        times.append((time.perf_counter() - started) / ops)
+    median = statistics.median(times)
+    return {"ops": ops, "repeat": repeat, "median_s": median, "best_s": min(times), "ops_per_s": 1 / median}
+
+
+def _format_time(seconds: float) -> str:
+    for unit, factor in (("s", 1), ("ms", 1e3), ("us", 1e6)):
+        if seconds >= 1 / factor:
+            return f"{seconds * factor:.2f} {unit}"
+    return f"{seconds * 1e9:.0f} ns"
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filter", default="", help="only cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5, help="timed repetitions per case (the median is reported)")
+    parser.add_argument("--quick", action="store_true", help="a tenth of the workload, for a smoke run")
+    parser.add_argument("--output", metavar="PATH", help="write results as JSON")
+    parser.add_argument("--compare", metavar="PATH", help="JSON from an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=15.0,
+                        help="with --compare, exit non-zero if a case got this many percent slower")
+    args = parser.parse_args(argv)
+
+    scale = 0.1 if args.quick else 1.0
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = {result["name"]: result for result in json.load(f)["results"]}
+
+    results = []
+    regressions = 0
+    print(f"{'Case':<32} {'per op':>10} {'ops/sec':>14}" + ("   vs baseline" if baseline else ""))
+    for name, setup in CASES.items():
+        if args.filter not in name:
+            continue
+        result = {"name": name, **measure(setup, scale, args.repeat)}
+        results.append(result)
+        line = f"{name:<32} {_format_time(result['median_s']):>10} {result['ops_per_s']:>14,.0f}"
+        before = baseline.get(name)
+        if before:
+            change = (result["median_s"] / before["median_s"] - 1) * 100
+            slower = change > args.threshold
+            regressions += slower
+            line += f"   {change:+6.1f}%" + ("  slower" if slower else "")
+        print(line)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "commit": _git_commit(),
+                "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "scale": scale,
+                "results": results,
+            }, f, indent=2)
+        print(f"\nWrote {len(results)} results to {args.output}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
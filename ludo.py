@@ -1,56 +1,66 @@
-from rich.console import Console
-from rich.table import Table
-from rich.prompt import Prompt
-from datetime import datetime
-
-# Persistence
-try:
-    from ludo_cli.db import get_session_factory
-    from ludo_cli.models import Base, Player as PlayerModel, Game as GameModel, Move as MoveModel
-except Exception:
-    # Allow running without DB on systems without the package
-    get_session_factory = None
-    PlayerModel = None
-    GameModel = None
-    MoveModel = None
+import argparse
+import atexit
 import random
-
-console = Console()
-
-#  eeh apa we setup players and tokens with player-specific starting positions juu last time movement ilitushinda
-players = {
-    "Player 1": {"color": "Red", "tokens": [0, 0, 0, 0], "start_pos": 1, "finish_entry": 50},
-    "Player 2": {"color": "Blue", "tokens": [0, 0, 0, 0], "start_pos": 14, "finish_entry": 11},
-    "Player 3": {"color": "Green", "tokens": [0, 0, 0, 0], "start_pos": 27, "finish_entry": 24},
-    "Player 4": {"color": "Yellow", "tokens": [0, 0, 0, 0], "start_pos": 40, "finish_entry": 37}
-}
-
-# Mapping player names to letters for the board
-player_letters = {
-    "Player 1": "R",
-    "Player 2": "B", 
-    "Player 3": "G",
-    "Player 4": "Y"
-}
-
-# Safe positions where tokens can't be captured (ka the origi Ludo safe spots)
-safe_positions = [1, 9, 14, 22, 27, 35, 40, 48]
-
-# Track consecutive 6s for each player
-consecutive_sixes = {"Player 1": 0, "Player 2": 0, "Player 3": 0, "Player 4": 0}
+import sys
+import time
+
+from ludo_cli.engine import (
+    GameState,
+    PLAYER_NAMES,
+    PLAYER_COLORS,
+    START_POSITIONS,
+    legal_moves,
+    register_roll,
+    apply_move,
+    end_turn,
+    check_winner,
+    penalty_move,
+)
+from ludo_cli import metrics
+from ludo_cli.policies import POLICIES, make_policy, parse_seats
+
+# rich, SQLAlchemy and dotenv each cost tens of milliseconds to import, so they
+# are only loaded by the code paths that use them: headless modes never do.
+
+class _LazyConsole:
+    """Stands in for rich's ``Console`` until the first thing is printed."""
+
+    def __getattr__(self, name):
+        return getattr(get_console(), name)
+
+console = _LazyConsole()
+board_renderer = None  # ludo_cli.board.BoardRenderer, created by the first print_board
+
+def get_console():
+    """The real rich ``Console`` (created on first use), for code that needs the object itself."""
+    global console
+    if isinstance(console, _LazyConsole):
+        from rich.console import Console
+        console = Console()
+    return console
+
+def load_persistence():
+    """Import the database layer on first use; ``None`` when its packages are missing."""
+    try:
+        from ludo_cli import db, persistence, replay
+    except Exception:
+        # Allow running without DB on systems without the package
+        return None
+    return db, persistence, replay
 
 def welcome_screen():
+    from rich.table import Table
     console.print("[bold green]🎲 Welcome to Terminal Ludo! 🎲[/bold green]\n")
     table = Table(title="Players")
     table.add_column("Player", style="cyan", justify="center")
     table.add_column("Color", style="magenta", justify="center")
     table.add_column("Start Position", style="yellow", justify="center")
     
-    for name, info in players.items():
+    for name, color, start_pos in zip(PLAYER_NAMES, PLAYER_COLORS, START_POSITIONS):
         table.add_row(
             name, 
-            f"[bold {info['color'].lower()}]{info['color']}[/bold {info['color'].lower()}]",
-            str(info['start_pos'])
+            f"[bold {color.lower()}]{color}[/bold {color.lower()}]",
+            str(start_pos)
         )
     console.print(table)
     console.print("\n[bold yellow]Game Rules:[/bold yellow]")
@@ -64,150 +74,53 @@ def welcome_screen():
 
 ################################################################################################################################
 
-def roll_dice(player):
+def roll_dice(state):
+    """Roll for the seat to move; returns the effective roll (0 after the three-sixes penalty)."""
+    player = PLAYER_NAMES[state.current]
     dice = random.randint(1, 6)
     console.print(f"[bold yellow]{player}[/bold yellow] rolled a 🎲 [bold cyan]{dice}[/bold cyan]")
     
-    # Track consecutive 6s
-    if dice == 6:
-        consecutive_sixes[player] += 1
-        if consecutive_sixes[player] >= 3:
-            console.print(f"[bold red]Three consecutive 6s! {player}'s most recent token returns home![/bold red]")
-            # Find the token that's furthest along and send it home
-            tokens = players[player]["tokens"]
-            max_pos = max(tokens) if any(t > 0 for t in tokens) else 0
-            if max_pos > 0:
-                for i, pos in enumerate(tokens):
-                    if pos == max_pos:
-                        tokens[i] = 0
-                        break
-            consecutive_sixes[player] = 0
-            return 0  # No move allowed
-    else:
-        consecutive_sixes[player] = 0
-    
-    return dice
-
-def get_movable_tokens(player, dice):
-    """Get list of tokens that can be moved with the current dice roll"""
-    tokens = players[player]["tokens"]
-    start_pos = players[player]["start_pos"]
-    finish_entry = players[player]["finish_entry"]
-    movable = []
-    
-    for i, pos in enumerate(tokens):
-        # Token at home can only enter on a 6
-        if pos == 0:
-            if dice == 6:
-                movable.append(i)
-            continue
-
-        # Token in finish lane (51-57)
-        if 51 <= pos <= 57:
-            target = pos + dice
-            if target <= 57:  # must not overshoot finish
-                movable.append(i)
-            continue
-
-        # Token on main ring (1-52)
-        # Determine if this move reaches/enters finish lane for this player
-        steps_to_entry = (finish_entry - pos) % 52
-        if dice <= steps_to_entry:
-            # Stays on ring
-            movable.append(i)
-        else:
-            remaining_into_lane = dice - steps_to_entry - 1
-            if 0 <= remaining_into_lane <= 6:
-                # Can enter lane and not overshoot
-                movable.append(i)
-    
-    return movable
-
-def calculate_new_position(player, current_pos, dice_roll):
-    """Calculate new absolute position respecting per-player finish entry and finish lane.
-
-    Representation:
-    - 0 = home
-    - 1..52 = ring squares (absolute around the board)
-    - 51..57 = player's finish lane steps (we map to player-specific lane when rendering)
-    """
-    start_pos = players[player]["start_pos"]
-    finish_entry = players[player]["finish_entry"]
-
-    # Entering the board
-    if current_pos == 0:
-        return start_pos
-
-    # Already in finish lane
-    if 51 <= current_pos <= 57:
-        # Must not overshoot final 57
-        target = current_pos + dice_roll
-        return target if target <= 57 else current_pos
-
-    # On the main ring. Compute steps to the finish entry square clockwise.
-    steps_to_entry = (finish_entry - current_pos) % 52
-    if dice_roll <= steps_to_entry:
-        # Move stays on ring
-        target = current_pos + dice_roll
-        return target if target <= 52 else target - 52
-    else:
-        # Enter the finish lane if possible
-        remaining_into_lane = dice_roll - steps_to_entry - 1
-        # If remaining exceeds the lane length (6), movement is invalid; stay
-        if remaining_into_lane < 0:
-            # Should not happen, but guard anyway
-            target = current_pos + dice_roll
-            return target if target <= 52 else target - 52
-        if remaining_into_lane <= 6:
-            return 51 + remaining_into_lane
-        # Cannot move; would overshoot the lane
-        return current_pos
-
-def capture_token(position, current_player):
-    """Check if any opponent tokens are captured at this position"""
-    captured = []
-    
-    # Skip if position is safe or in finish lane
-    if position in safe_positions or position >= 51:
-        return captured
-    
-    for player, info in players.items():
-        if player == current_player:
-            continue
-            
-        for i, token_pos in enumerate(info["tokens"]):
-            if token_pos == position:
-                info["tokens"][i] = 0  # Send back to start
-                captured.append((player, i + 1))
-    
-    return captured
+    effective = register_roll(state, dice)
+    if dice == 6 and effective == 0:
+        console.print(f"[bold red]Three consecutive 6s! {player}'s most recent token returns home![/bold red]")
+    return effective
 
-def move_token(player, dice):
-    """Handle token movement with player choice. Returns tuple (moved, token_idx, old_pos, new_pos)."""
+def move_token(state, dice, policy=None, timer=metrics.NULL_TIMER):
+    """Handle token movement with player choice (or ``policy`` for a bot seat). Returns tuple (moved, token_idx, old_pos, new_pos)."""
     if dice == 0:  # Three consecutive 6s penalty
         return False, None, None, None
         
-    movable_tokens = get_movable_tokens(player, dice)
+    seat = state.current
+    player = PLAYER_NAMES[seat]
+    moves = legal_moves(state, dice)
+    timer.lap("movegen")
     
-    if not movable_tokens:
+    if not moves:
         console.print(f"[bold red]No valid moves for {player}![/bold red]")
         return False, None, None, None
     
     # Show current token positions
-    show_player_tokens(player)
+    show_player_tokens(state, seat)
+    timer.lap("render")
     
-    if len(movable_tokens) == 1:
+    if len(moves) == 1:
         # Only one option, move automatically
-        token_idx = movable_tokens[0]
-        console.print(f"[bold cyan]Moving token {token_idx + 1} automatically...[/bold cyan]")
+        move = moves[0]
+        console.print(f"[bold cyan]Moving token {move.token + 1} automatically...[/bold cyan]")
+    elif policy is not None:
+        move = policy.choose(state, dice, moves)
+        detail = f" ({policy.summary})" if hasattr(policy, "summary") else ""
+        console.print(f"[bold cyan]{policy.name} bot chooses token {move.token + 1}{detail}[/bold cyan]")
     else:
         # Multiple options, let player choose
-        console.print(f"[bold cyan]Movable tokens: {[i+1 for i in movable_tokens]}[/bold cyan]")
+        by_token = {m.token: m for m in moves}
+        console.print(f"[bold cyan]Movable tokens: {[m.token + 1 for m in moves]}[/bold cyan]")
+        from rich.prompt import Prompt
         while True:
             try:
                 choice = int(Prompt.ask("Choose token to move (number)")) - 1
-                if choice in movable_tokens:
-                    token_idx = choice
+                if choice in by_token:
+                    move = by_token[choice]
                     break
                 else:
                     console.print("[bold red]Invalid choice! Choose from available tokens.[/bold red]")
@@ -215,30 +128,28 @@ def move_token(player, dice):
                 console.print("[bold red]Please enter a valid number![/bold red]")
     
     # Move the chosen token
-    old_pos = players[player]["tokens"][token_idx]
-    new_pos = calculate_new_position(player, old_pos, dice)
+    timer.lap("select")
+    captured = apply_move(state, move)
+    timer.lap("apply")
+    color = PLAYER_COLORS[seat].lower()
     
-    players[player]["tokens"][token_idx] = new_pos
-    
-    if old_pos == 0:  # Entering board
-        console.print(f"[bold {players[player]['color'].lower()}]{player}'s token {token_idx + 1} enters the board at position {new_pos}![/bold {players[player]['color'].lower()}]")
+    if move.old_pos == 0:  # Entering board
+        console.print(f"[bold {color}]{player}'s token {move.token + 1} enters the board at position {move.new_pos}![/bold {color}]")
     else:  # Moving on board
-        console.print(f"[bold {players[player]['color'].lower()}]{player}'s token {token_idx + 1} moves from {old_pos} to {new_pos}[/bold {players[player]['color'].lower()}]")
+        console.print(f"[bold {color}]{player}'s token {move.token + 1} moves from {move.old_pos} to {move.new_pos}[/bold {color}]")
     
-    # Check for captures (only if not in finish lane)
-    if new_pos < 51:
-        captured = capture_token(new_pos, player)
-        for captured_player, captured_token in captured:
-            console.print(f"[bold red]💥 {captured_player}'s token {captured_token} was captured and sent home![/bold red]")
+    for captured_player, captured_token in captured:
+        console.print(f"[bold red]💥 {PLAYER_NAMES[captured_player]}'s token {captured_token + 1} was captured and sent home![/bold red]")
     
-    return True, token_idx, old_pos, new_pos
+    return True, move.token, move.old_pos, move.new_pos
 
-def show_player_tokens(player):
+def show_player_tokens(state, seat):
     """Show current positions of player's tokens"""
-    tokens = players[player]["tokens"]
-    color = players[player]["color"].lower()
+    from rich.table import Table
+    tokens = state.player_tokens(seat)
+    color = PLAYER_COLORS[seat].lower()
     
-    table = Table(title=f"{player}'s Tokens")
+    table = Table(title=f"{PLAYER_NAMES[seat]}'s Tokens")
     table.add_column("Token", style="cyan")
     table.add_column("Position", style="magenta")
     table.add_column("Status", style="green")
@@ -261,279 +172,367 @@ def show_player_tokens(player):
     
     console.print(table)
 
-def check_winner(player):
-    """Check if player has won (all tokens at position 57)"""
-    return all(token == 57 for token in players[player]["tokens"])
-
 ###############################################################################################################################
-def print_board():
-    """Print the Ludo board with colorful layout"""
-    # Create 15x15 board
-    board = [["  " for _ in range(15)] for _ in range(15)]
-    
-    # Fill home areas (6x6 in corners) with colors
-    # Top-left = Red home  
-    for r in range(0, 6):
-        for c in range(0, 6):
-            board[r][c] = "[red]R[/red] "
-    
-    # Top-right = Blue home
-    for r in range(0, 6):
-        for c in range(9, 15):
-            board[r][c] = "[blue]B[/blue] "
-    
-    # Bottom-left = Green home
-    for r in range(9, 15):
-        for c in range(0, 6):
-            board[r][c] = "[green]G[/green] "
-    
-    # Bottom-right = Yellow home
-    for r in range(9, 15):
-        for c in range(9, 15):
-            board[r][c] = "[yellow]Y[/yellow] "
-    
-    # Create the cross-shaped path
-    # Vertical paths
-    for r in range(0, 15):
-        if r != 7:  # Skip center row
-            board[r][6] = "[white]○[/white] "
-            board[r][8] = "[white]○[/white] "
-    
-    # Horizontal paths
-    for c in range(0, 15):
-        if c != 7:  # Skip center column
-            board[6][c] = "[white]○[/white] "
-            board[8][c] = "[white]○[/white] "
-    
-    # Mark safe spots with stars based on ring indices in safe_positions
-    # Map ring indices to board coordinates and decorate them
-    # (we'll fill token_positions later; temporarily collect here and decorate after mapping)
-    
-    # Create finish lanes leading to center
-    # Red finish lane (going right toward center)
-    for c in range(1, 6):
-        board[7][c] = "[bold red]△[/bold red] "
-    
-    # Blue finish lane (going down toward center)  
-    for r in range(1, 6):
-        board[r][7] = "[bold blue]△[/bold blue] "
-    
-    # Green finish lane (going left toward center)
-    for c in range(9, 14):
-        board[7][c] = "[bold green]△[/bold green] "
-    
-    # Yellow finish lane (going up toward center)
-    for r in range(9, 14):
-        board[r][7] = "[bold yellow]△[/bold yellow] "
-    
-    # Center square (finish position)
-    board[7][7] = "[bold magenta]★[/bold magenta] "
-    
-    # Mark starting positions for each player
-    start_markers = [(6, 1), (1, 8), (8, 13), (13, 6)]  # Red, Blue, Green, Yellow
-    start_colors = ["red", "blue", "green", "yellow"]
-    
-    for i, (r, c) in enumerate(start_markers):
-        board[r][c] = f"[bold {start_colors[i]}]◉[/bold {start_colors[i]}] "
-    
-    # Comprehensive token position mapping for proper Ludo circuit
-    token_positions = {}
-    
-    # Main circuit positions (1-52) mapped to board coordinates
-    # Starting from Red's entry and going clockwise
-    circuit_coords = [
-        # Red's path (bottom row, going right)
-        (8, 1), (8, 2), (8, 3), (8, 4), (8, 5),
-        (8, 6), (8, 7), (8, 8), (8, 9), (8, 10), 
-        (8, 11), (8, 12), (8, 13),
-        
-        # Right side going up
-        (7, 13), (6, 13), (5, 13), (4, 13), (3, 13),
-        (2, 13), (1, 13), (0, 13),
-        
-        # Top side going left  
-        (0, 12), (0, 11), (0, 10), (0, 9), (0, 8),
-        (0, 7), (0, 6), (0, 5), (0, 4), (0, 3),
-        (0, 2), (0, 1), (0, 0),
-        
-        # Left side going down
-        (1, 0), (2, 0), (3, 0), (4, 0), (5, 0),
-        (6, 0), (7, 0), (8, 0), (9, 0), (10, 0),
-        (11, 0), (12, 0), (13, 0), (14, 0),
-        
-        # Bottom going right back to start
-        (14, 1), (14, 2), (14, 3), (14, 4), (14, 5), (14, 6)
-    ]
-    
-    # Map circuit positions 1-52
-    for i, coord in enumerate(circuit_coords[:52]):
-        token_positions[i + 1] = coord
-    
-    # Finish lane positions (51-57) are player-specific; build per-player maps
-    finish_lane_coords = {
-        "Player 1": [(7, 1), (7, 2), (7, 3), (7, 4), (7, 5), (7, 6), (7, 7)],            # Red → right to center
-        "Player 2": [(1, 7), (2, 7), (3, 7), (4, 7), (5, 7), (6, 7), (7, 7)],            # Blue → down to center
-        "Player 3": [(7, 13), (7, 12), (7, 11), (7, 10), (7, 9), (7, 8), (7, 7)],        # Green → left to center
-        "Player 4": [(13, 7), (12, 7), (11, 7), (10, 7), (9, 7), (8, 7), (7, 7)],        # Yellow → up to center
-    }
-    
-    # Decorate safe ring squares
-    for idx in safe_positions:
-        if idx in token_positions:
-            r, c = token_positions[idx]
-            if 0 <= r < 15 and 0 <= c < 15:
-                board[r][c] = "[bold white]★[/bold white] "
-
-    # Place player tokens on board
-    for player, info in players.items():
-        color = info["color"].lower()
-        letter = player_letters[player]
-        
-        for token_pos in info["tokens"]:
-            if token_pos > 0 and 1 <= token_pos <= 52:
-                if token_pos in token_positions:
-                    row, col = token_positions[token_pos]
-                    if 0 <= row < 15 and 0 <= col < 15:
-                        board[row][col] = f"[bold {color}]{letter}[/bold {color}] "
-            elif 51 <= token_pos <= 57:
-                # Player-specific finish lane
-                lane_idx = token_pos - 51
-                coords = finish_lane_coords[player]
-                row, col = coords[lane_idx]
-                if 0 <= row < 15 and 0 <= col < 15:
-                    board[row][col] = f"[bold {color}]{letter}[/bold {color}] "
-    
-    # Print the board
-    console.print("\n[bold cyan]🎯 LUDO BOARD 🎯[/bold cyan]\n")
-    
-    for row in board:
-        console.print("".join(row))
-    
-    console.print("\n[bold green]Legend:[/bold green]")
-    console.print("[red]R[/red]/[blue]B[/blue]/[green]G[/green]/[yellow]Y[/yellow] = Home areas")
-    console.print("[white]○[/white] = Regular path")
-    console.print("[bold white]★[/bold white] = Safe spots")
-    console.print("[bold red]△[/bold red]/[bold blue]△[/bold blue]/[bold green]△[/bold green]/[bold yellow]△[/bold yellow] = Finish lanes") 
-    console.print("[bold magenta]★[/bold magenta] = Center (finish)")
-    console.print("[bold red]◉[/bold red]/[bold blue]◉[/bold blue]/[bold green]◉[/bold green]/[bold yellow]◉[/bold yellow] = Starting positions")
-    console.print("[bold red]R[/bold red]/[bold blue]B[/bold blue]/[bold green]G[/bold green]/[bold yellow]Y[/bold yellow] = Player tokens")
-
-def print_game_status():
+def print_board(state):
+    """Print the Ludo board in one write; only cells whose tokens moved since the last call are redrawn."""
+    global board_renderer
+    if board_renderer is None:
+        from ludo_cli.board import BoardRenderer
+        board_renderer = BoardRenderer()
+    console.print(board_renderer.board(state))
+
+def print_game_status(state):
     """Print current game status for all players"""
-    table = Table(title="Game Status")
-    table.add_column("Player", style="cyan")
-    table.add_column("Tokens Home", style="red")
-    table.add_column("Tokens On Board", style="yellow") 
-    table.add_column("Tokens in Finish", style="blue")
-    table.add_column("Tokens Finished", style="green")
-    table.add_column("Consecutive 6s", style="magenta")
-    
-    for player, info in players.items():
-        tokens = info["tokens"]
-        home = sum(1 for t in tokens if t == 0)
-        on_board = sum(1 for t in tokens if 0 < t < 51)
-        in_finish = sum(1 for t in tokens if 51 <= t < 57)
-        finished = sum(1 for t in tokens if t == 57)
-        sixes = consecutive_sixes[player]
-        
-        table.add_row(player, str(home), str(on_board), str(in_finish), str(finished), str(sixes))
-    
-    console.print(table)
+    from ludo_cli.board import status_table
+    console.print(status_table(state))
 
 ############################################################################################################################
-def main():
+def seat_policies(seats, think_ms=None, rollouts=None, mcts_workers=None):
+    """One policy per seat (``None`` for a human), with search budgets from the command line."""
+    policies = [None if name == "human" else make_policy(name) for name in seats]
+    for policy in policies:
+        if mcts_workers is not None and hasattr(policy, "workers"):
+            policy.workers = mcts_workers
+        if think_ms is not None and hasattr(policy, "time_budget"):
+            policy.time_budget = think_ms / 1000
+        if rollouts is not None and hasattr(policy, "rollouts"):
+            policy.rollouts = rollouts
+            if think_ms is None:
+                policy.time_budget = None
+    return policies
+
+def main(resume_id=None, seats=None, think_ms=None, rollouts=None, use_db=True, mcts_workers=None):
+    """Play in the terminal; ``seats`` names a policy (or ``"human"``) per seat.
+
+    ``think_ms`` is the per-move time budget for search bots; ``rollouts``
+    bounds MCTS bots by rollouts instead (both if both are given) and
+    ``mcts_workers`` spreads each MCTS search over that many processes. With
+    ``use_db=False`` nothing is recorded and the database layer is never imported.
+    """
+    from rich.prompt import Prompt
+    policies = seat_policies(seats or ["human"] * len(PLAYER_NAMES), think_ms, rollouts, mcts_workers)
     welcome_screen()
     input("\nPress [Enter] to start the game...")
     
     # Setup persistence (optional)
-    SessionFactory = get_session_factory() if get_session_factory else None
-    session = SessionFactory() if SessionFactory else None
-    game_id = None
+    modules = load_persistence() if use_db else None
+    session = modules[0].get_session_factory()() if modules else None
+    snapshot_every = modules[2].SNAPSHOT_INTERVAL if modules else 0
+    state = GameState()
     turn_counter = 0
+    recorder = None
+
+    if resume_id is not None and not session:
+        console.print("[bold red]Resuming needs the database packages (SQLAlchemy).[/bold red]")
+        return
+    if session:
+        from sqlalchemy.exc import SQLAlchemyError
+        _, persistence, replay = modules
+        try:
+            if resume_id is not None:
+                state, turn_counter = replay.restore_game(session, resume_id)
+                recorder = persistence.BackgroundMoveRecorder.resume(session, resume_id)
+            else:
+                recorder = persistence.BackgroundMoveRecorder.start(session)
+        except ValueError as exc:
+            console.print(f"[bold red]Cannot resume: {exc}[/bold red]")
+            session.close()
+            return
+        except SQLAlchemyError as exc:
+            # Typically a database that is missing migrations
+            reason = getattr(exc, "orig", None) or exc
+            session.close()
+            if resume_id is not None:
+                console.print(f"[bold red]Cannot use the database: {reason}[/bold red]")
+                console.print("Run `alembic upgrade head` to update it.")
+                return
+            console.print(f"[bold yellow]Not recording this game: {reason}[/bold yellow]")
+            console.print("Run `alembic upgrade head` to update the database and record games.")
+            session = None
+
+    if resume_id is not None:
+        console.print(f"[bold green]Resuming game {resume_id} at turn {turn_counter}[/bold green]")
+        print_board(state)
+        print_game_status(state)
 
-    if session and GameModel and PlayerModel:
-        # Ensure players exist
-        existing_players = {p.name: p for p in session.query(PlayerModel).all()}
-        for name, info in players.items():
-            if name not in existing_players:
-                p = PlayerModel(name=name, color=info["color"])
-                session.add(p)
-        session.commit()
-
-        # Create game record
-        game = GameModel(started_at=datetime.utcnow())
-        session.add(game)
-        session.commit()
-        game_id = game.id
-
-    player_list = list(players.keys())
-    current_turn = 0
     game_over = False
+    winner_seat = None
     
-    while not game_over:
-        player = player_list[current_turn]
-        
-        console.print(f"\n{'='*50}")
-        console.print(f"[bold cyan]{player}'s turn![/bold cyan]")
-        
-        input("Press [Enter] to roll the dice... ")
-        dice = roll_dice(player)
-        
-        # Try to move a token
-        moved, token_idx, old_pos, new_pos = move_token(player, dice)
-        
-        # Persist move if applicable
-        if session and game_id and MoveModel and PlayerModel and moved and token_idx is not None:
-            db_player = session.query(PlayerModel).filter_by(name=player).first()
-            mv = MoveModel(
-                game_id=game_id,
-                player_id=db_player.id if db_player else None,
-                turn_index=turn_counter,
-                dice=dice,
-                token_index=token_idx + 1,
-                old_pos=old_pos,
-                new_pos=new_pos,
-            )
-            session.add(mv)
-            session.commit()
-
-        turn_counter += 1
-
-        # Print updated board and status
-        print_board()
-        print_game_status()
-        
-        # Check for winner
-        if check_winner(player):
-            console.print(f"\n🎉 [bold green]{player} WINS![/bold green] 🎉")
-            console.print("All tokens have reached the finish line!")
-            game_over = True
-            break
-        
-        # Handle turn progression
-        if dice == 6 and moved and dice != 0:
-            console.print("🎲 [bold yellow]You rolled a 6! Take another turn![/bold yellow]")
-            # Don't change current_turn, same player goes again
-        else:
-            # Move to next player
-            current_turn = (current_turn + 1) % len(player_list)
-        
-        # Ask if player wants to continue or quit
-        if not game_over:
-            choice = Prompt.ask("\nContinue playing? ([bold green]y[/bold green]/[bold red]n[/bold red])", default="y")
-            if choice.lower() in ['n', 'no', 'quit', 'exit']:
-                console.print("Thanks for playing! 👋")
+    try:
+        while not game_over:
+            seat = state.current
+            player = PLAYER_NAMES[seat]
+            
+            console.print(f"\n{'='*50}")
+            console.print(f"[bold cyan]{player}'s turn![/bold cyan]")
+            
+            policy = policies[seat]
+            if policy is None:
+                input("Press [Enter] to roll the dice... ")
+            timer = metrics.timer()
+            penalty = penalty_move(state, seat)
+            dice = roll_dice(state)
+            timer.lap("roll")
+            
+            # Try to move a token
+            moved, token_idx, old_pos, new_pos = move_token(state, dice, policy, timer)
+            
+            # Persist move if applicable (queued; a writer thread commits in batches)
+            if recorder and moved and token_idx is not None:
+                recorder.record(seat, turn_counter, dice, token_idx + 1, old_pos, new_pos)
+            elif recorder and dice == 0 and penalty:
+                # Three-sixes penalty, stored as a dice-0 move so replays see it
+                recorder.record(seat, turn_counter, 0, penalty.token + 1, penalty.old_pos, penalty.new_pos)
+
+            turn_counter += 1
+
+            # Print updated board and status
+            timer.restart()
+            print_board(state)
+            print_game_status(state)
+            timer.lap("render")
+            
+            # Check for winner
+            if check_winner(state, seat):
+                console.print(f"\n🎉 [bold green]{player} WINS![/bold green] 🎉")
+                console.print("All tokens have reached the finish line!")
+                winner_seat = seat
+                game_over = True
                 break
-
-    # Close game
-    if session and game_id and GameModel:
-        game = session.query(GameModel).get(game_id)
-        if game:
-            game.ended_at = datetime.utcnow()
-            session.commit()
+            
+            # Handle turn progression
+            if dice == 6 and moved:
+                console.print("🎲 [bold yellow]You rolled a 6! Take another turn![/bold yellow]")
+            end_turn(state, dice, moved)
+            if recorder:
+                # Resume point after every turn, including ones that moved nothing
+                recorder.checkpoint(turn_counter - 1, state)
+                if turn_counter % snapshot_every == 0:
+                    recorder.snapshot(turn_counter - 1, state)
+            
+            # Ask if player wants to continue or quit (bots just play on)
+            if not game_over and policy is None:
+                choice = Prompt.ask("\nContinue playing? ([bold green]y[/bold green]/[bold red]n[/bold red])", default="y")
+                if choice.lower() in ['n', 'no', 'quit', 'exit']:
+                    console.print("Thanks for playing! 👋")
+                    break
+    finally:
+        # Close game: flush queued moves and the last checkpoint even on Ctrl-C
+        try:
+            if recorder:
+                recorder.close(winner=winner_seat)
+        finally:
+            if session:
+                session.close()
+
+def run_simulation(args):
+    """Headless batch mode: no prompts, no board, just the summary report."""
+    from ludo_cli.simulate import simulate, format_report
+    if args.vectorized:
+        # NumPy is only needed for the lockstep simulator
+        from ludo_cli.vecsim import simulate_vectorized
+        try:
+            stats = simulate_vectorized(args.games, seed=args.seed, batch_size=args.batch_size, policy=args.policy)
+        except ValueError as exc:
+            console.print(f"[bold red]{exc}[/bold red]")
+            return
+    else:
+        stats = simulate(args.games, seed=args.seed, workers=args.workers, policy=args.policy,
+                         chunk_size=args.chunk_size, move_log=args.move_log, timed=metrics.enabled)
+        if stats.timings:
+            metrics.TIMINGS.merge(stats.timings)
+    print(format_report(stats))
+    if args.move_log:
+        print(f"Move log:         {args.move_log}")
+
+def run_spectate(args):
+    """Watch bots play: the game runs at full speed while a render thread draws the newest position."""
+    from ludo_cli.board import LiveBoard
+    from ludo_cli.spectate import ThrottledView, autoplay
+    policies = seat_policies(args.seats, args.think_ms, args.rollouts, args.mcts_workers)
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+    with LiveBoard(get_console()) as board:
+        view = ThrottledView(board, fps=args.fps, every=args.every, end_only=args.end_only)
+        try:
+            winner, turns = autoplay(policies, view, rng, turn_delay=args.turn_ms / 1000)
+        finally:
+            view.close()
+    elapsed = time.perf_counter() - started
+    console.print(f"[bold green]{PLAYER_NAMES[winner]} ({args.seats[winner]}) wins[/bold green] after {turns} turns "
+                  f"in {elapsed:.2f}s ({turns / elapsed:,.0f} turns/sec)")
+    console.print(f"{view.drawn} frames drawn, {view.dropped} skipped")
+
+def dump_metrics(path=None):
+    """On exit: the per-phase timing table on stderr, and Prometheus text to ``path`` if given."""
+    if not metrics.TIMINGS.histograms:
+        return
+    print("\nTurn phase timings:\n" + metrics.TIMINGS.format_table(), file=sys.stderr)
+    if path:
+        metrics.write_prometheus(path)
+        print(f"Wrote Prometheus metrics to {path}", file=sys.stderr)
+
+def run_import_log(args):
+    """Copy a binary move log from `simulate --move-log` into the moves table."""
+    modules = load_persistence()
+    if not modules:
+        console.print("[bold red]Importing needs the database packages (SQLAlchemy).[/bold red]")
+        return
+    from ludo_cli.movelog import import_log
+    session = modules[0].get_session_factory()()
+    try:
+        game_ids = import_log(session, args.path)
+    finally:
+        session.close()
+    console.print(f"[bold green]Imported {len(game_ids)} games from {args.path}[/bold green]")
+
+def run_replay(args):
+    """Show a stored game's board at one turn (or at every --step turns); returns the exit status."""
+    modules = load_persistence()
+    if not modules:
+        console.print("[bold red]Replay needs the database packages (SQLAlchemy).[/bold red]")
+        return
+    db, _, replay = modules
+    session = db.get_session_factory()()
+    try:
+        if args.build_snapshots:
+            count = replay.build_snapshots(session, args.game_id)
+            console.print(f"[bold green]Wrote {count} snapshots for game {args.game_id}[/bold green]")
+        replayer = replay.GameReplayer(session, args.game_id)
+        if args.step:
+            # Stepping repaints one frame in place rather than scrolling a board per step
+            from ludo_cli.board import LiveBoard
+            with LiveBoard(get_console()) as view:
+                for turn in range(0, args.turn + 1, args.step):
+                    view.show(replayer.seek(turn), f"[bold cyan]Game {args.game_id} after turn {turn}[/bold cyan]")
+        else:
+            state = replayer.seek(args.turn)
+            console.print(f"\n[bold cyan]Game {args.game_id} after turn {args.turn}[/bold cyan]")
+            print_board(state)
+            print_game_status(state)
+    except replay.ReplayError as exc:
+        console.print(f"[bold red]Cannot replay game {args.game_id}: {exc}[/bold red]")
+        return 1
+    finally:
         session.close()
 
-if __name__ == "__main__":
-    main()      
-
+def run_server(args):
+    """Host many games over JSON lines until interrupted."""
+    import asyncio
+    from ludo_cli.server import serve
+    where = args.unix or f"{args.host}:{args.port}"
+    console.print(f"[bold green]Serving Ludo on {where}[/bold green] (Ctrl-C to stop)")
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.turn_timeout, args.metrics_port,
+                          args.backlog, args.search_workers))
+    except KeyboardInterrupt:
+        console.print("Server stopped.")
+
+def positive_int(text):
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Terminal Ludo")
+    parser.add_argument("--think-ms", type=int, default=None, metavar="MS",
+                        help="thinking time per move for search bots (default 200)")
+    parser.add_argument("--rollouts", type=int, default=None, metavar="N",
+                        help="rollouts per move for MCTS bots (instead of, or with, --think-ms)")
+    parser.add_argument("--mcts-workers", type=positive_int, default=None, metavar="N",
+                        help="processes per MCTS search, each growing its own tree (default 1)")
+    parser.add_argument("--players", default="human", metavar="SEATS",
+                        help="'human' or a policy for every seat, or four comma-separated "
+                             f"(e.g. human,greedy,random,heuristic); policies: {', '.join(sorted(POLICIES))}")
+    parser.add_argument("--metrics", action="store_true",
+                        help="time every phase of each turn and print the histograms on exit")
+    parser.add_argument("--metrics-file", metavar="PATH",
+                        help="also write them to PATH in Prometheus text format (implies --metrics)")
+    parser.add_argument("--no-db", action="store_true",
+                        help="do not record the game (skips importing SQLAlchemy entirely)")
+    commands = parser.add_subparsers(dest="command")
+
+    sim = commands.add_parser("simulate", help="play games automatically and report statistics")
+    sim.add_argument("--games", type=positive_int, default=1000, help="number of games to play")
+    sim.add_argument("--seed", type=int, default=None, help="master random seed")
+    sim.add_argument("--workers", type=positive_int, default=None, help="worker processes (default: all cores)")
+    sim.add_argument("--chunk-size", type=positive_int, default=250, help="games per independently seeded chunk")
+    sim.add_argument("--policy", default="random",
+                     help=f"move chooser for every seat, or four comma-separated ({', '.join(sorted(POLICIES))})")
+    sim.add_argument("--vectorized", action="store_true", help="advance a NumPy batch of games in lockstep")
+    sim.add_argument("--batch-size", type=positive_int, default=16384, help="concurrent games with --vectorized")
+    sim.add_argument("--move-log", metavar="PATH", help="append every move to a binary move log")
+
+    spec = commands.add_parser("spectate", help="watch bots (--players) play, with a throttled live board")
+    spec.add_argument("--fps", type=float, default=10.0, help="most frames drawn per second (0: no limit)")
+    shown = spec.add_mutually_exclusive_group()
+    shown.add_argument("--every", type=int, default=1, metavar="N", help="only draw the board every N turns")
+    shown.add_argument("--end-only", action="store_true", help="only draw the final position")
+    spec.add_argument("--turn-ms", type=float, default=0.0, help="pause after every turn, to follow along")
+    spec.add_argument("--seed", type=int, default=None, help="dice seed")
+
+    rep = commands.add_parser("replay", help="show a stored game's board at a given turn")
+    rep.add_argument("game_id", type=int)
+    rep.add_argument("--turn", type=int, required=True, help="show the board after this turn")
+    rep.add_argument("--step", type=int, default=0, help="also show every STEP turns up to --turn")
+    rep.add_argument("--build-snapshots", action="store_true", help="(re)write snapshots for the game first")
+
+    imp = commands.add_parser("import-log", help="load a binary move log into the database")
+    imp.add_argument("path")
+
+    srv = commands.add_parser("serve", help="host many concurrent games over a JSON-lines socket protocol")
+    srv.add_argument("--host", default="127.0.0.1")
+    srv.add_argument("--port", type=int, default=8765)
+    srv.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    srv.add_argument("--turn-timeout", type=float, default=30.0, help="seconds before the server moves for a human seat")
+    srv.add_argument("--backlog", type=int, default=1024,
+                     help="connections the OS queues while the server is busy accepting")
+    srv.add_argument("--search-workers", type=int, default=None, metavar="N",
+                     help="processes shared by all tables for search bots (default: all cores)")
+    srv.add_argument("--metrics-port", type=int, metavar="PORT",
+                     help="serve Prometheus metrics over HTTP on this port (implies --metrics)")
+
+    res = commands.add_parser("resume", help="continue an interrupted game from the database")
+    res.add_argument("game_id", type=int)
+
+    args = parser.parse_args(argv)
+    try:
+        args.seats = parse_seats(args.players, extra=("human",))
+        if args.command == "simulate":
+            parse_seats(args.policy)
+    except ValueError as exc:
+        parser.error(str(exc))
+    if args.command == "spectate" and "human" in args.seats:
+        parser.error("spectate needs a bot in every seat, e.g. --players greedy,heuristic,random,mcts")
+    if args.no_db and args.command in ("replay", "import-log", "resume"):
+        parser.error(f"{args.command} needs the database; drop --no-db")
+    if args.command == "simulate" and args.vectorized and args.workers:
+        parser.error("--vectorized runs in a single process; drop --workers")
+    if args.command == "simulate" and args.vectorized and (args.metrics or args.metrics_file):
+        parser.error("--metrics times individual turns, which --vectorized does not play")
+    if args.command == "simulate" and args.vectorized and args.move_log:
+        parser.error("--move-log is not supported with --vectorized")
+    return args
 
+if __name__ == "__main__":
+    args = parse_args()
+    if args.metrics or args.metrics_file or getattr(args, "metrics_port", None):
+        metrics.enable()
+        atexit.register(dump_metrics, args.metrics_file)
+    if args.command == "simulate":
+        run_simulation(args)
+    elif args.command == "spectate":
+        run_spectate(args)
+    elif args.command == "replay":
+        sys.exit(run_replay(args))
+    elif args.command == "import-log":
+        run_import_log(args)
+    elif args.command == "serve":
+        run_server(args)
+    elif args.command == "resume":
+        main(resume_id=args.game_id, seats=args.seats, think_ms=args.think_ms, rollouts=args.rollouts,
+             mcts_workers=args.mcts_workers)
+    else:
+        main(seats=args.seats, think_ms=args.think_ms, rollouts=args.rollouts, use_db=not args.no_db,
+             mcts_workers=args.mcts_workers)
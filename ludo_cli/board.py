@@ -0,0 +1,222 @@
+"""Terminal board rendering: a precomputed layout with per-cell updates.
+
+The 15x15 grid, the square-to-cell maps and the legend never change, so they
+are built once at import. :class:`BoardRenderer` keeps the previous frame's
+rows and, for a new state, redraws only the cells whose tokens changed (and
+re-parses only the rows holding them). :class:`LiveBoard` repaints the board
+and status table in place with rich ``Live``, one terminal write per frame,
+instead of scrolling a full reprint after every move.
+"""
+from typing import Optional
+
+from rich.console import Console, Group
+from rich.highlighter import ReprHighlighter
+from rich.live import Live
+from rich.table import Table
+from rich.text import Text
+
+from .engine import (
+    PLAYER_COLORS,
+    PLAYER_LETTERS,
+    PLAYER_NAMES,
+    SAFE_POSITIONS,
+    SEAT_MASKS,
+    TOKENS_PER_PLAYER,
+    GameState,
+)
+
+SIZE = 15
+
+# Ring squares 1-52 mapped to board cells, starting from Red's entry and going clockwise
+RING_CELLS = dict(enumerate([
+    # Red's path (bottom row, going right)
+    (8, 1), (8, 2), (8, 3), (8, 4), (8, 5),
+    (8, 6), (8, 7), (8, 8), (8, 9), (8, 10),
+    (8, 11), (8, 12), (8, 13),
+    # Right side going up
+    (7, 13), (6, 13), (5, 13), (4, 13), (3, 13),
+    (2, 13), (1, 13), (0, 13),
+    # Top side going left
+    (0, 12), (0, 11), (0, 10), (0, 9), (0, 8),
+    (0, 7), (0, 6), (0, 5), (0, 4), (0, 3),
+    (0, 2), (0, 1), (0, 0),
+    # Left side going down
+    (1, 0), (2, 0), (3, 0), (4, 0), (5, 0),
+    (6, 0), (7, 0), (8, 0), (9, 0), (10, 0),
+    (11, 0), (12, 0), (13, 0), (14, 0),
+    # Bottom going right back to start
+    (14, 1), (14, 2), (14, 3), (14, 4),
+], start=1))
+
+# Finish lane squares 51-57 per seat (51 and 52 are drawn on the ring)
+LANE_CELLS = (
+    ((7, 1), (7, 2), (7, 3), (7, 4), (7, 5), (7, 6), (7, 7)),            # Red → right to center
+    ((1, 7), (2, 7), (3, 7), (4, 7), (5, 7), (6, 7), (7, 7)),            # Blue → down to center
+    ((7, 13), (7, 12), (7, 11), (7, 10), (7, 9), (7, 8), (7, 7)),        # Green → left to center
+    ((13, 7), (12, 7), (11, 7), (10, 7), (9, 7), (8, 7), (7, 7)),        # Yellow → up to center
+)
+
+TOKEN_MARKUP = tuple(
+    f"[bold {color.lower()}]{letter}[/bold {color.lower()}] "
+    for color, letter in zip(PLAYER_COLORS, PLAYER_LETTERS)
+)
+
+
+def _static_layout() -> tuple[tuple[str, ...], ...]:
+    """Markup for every cell of an empty board."""
+    board = [["  " for _ in range(SIZE)] for _ in range(SIZE)]
+
+    # Home areas (6x6 in corners)
+    for rows, cols, color, letter in ((range(0, 6), range(0, 6), "red", "R"),
+                                      (range(0, 6), range(9, 15), "blue", "B"),
+                                      (range(9, 15), range(0, 6), "green", "G"),
+                                      (range(9, 15), range(9, 15), "yellow", "Y")):
+        for r in rows:
+            for c in cols:
+                board[r][c] = f"[{color}]{letter}[/{color}] "
+
+    # The cross-shaped path
+    for i in range(SIZE):
+        if i != 7:
+            board[i][6] = board[i][8] = "[white]○[/white] "
+            board[6][i] = board[8][i] = "[white]○[/white] "
+
+    # Finish lanes leading to the center
+    for i in range(1, 6):
+        board[7][i] = "[bold red]△[/bold red] "
+        board[i][7] = "[bold blue]△[/bold blue] "
+        board[7][i + 8] = "[bold green]△[/bold green] "
+        board[i + 8][7] = "[bold yellow]△[/bold yellow] "
+    board[7][7] = "[bold magenta]★[/bold magenta] "
+
+    # Starting squares, then safe squares on top
+    for (r, c), color in zip(((6, 1), (1, 8), (8, 13), (13, 6)), ("red", "blue", "green", "yellow")):
+        board[r][c] = f"[bold {color}]◉[/bold {color}] "
+    for pos in SAFE_POSITIONS:
+        r, c = RING_CELLS[pos]
+        board[r][c] = "[bold white]★[/bold white] "
+    return tuple(tuple(row) for row in board)
+
+
+STATIC_CELLS = _static_layout()
+
+# Highlighted the way console.print highlights plain strings
+_highlight = ReprHighlighter()
+TITLE = _highlight(Text.from_markup("\n[bold cyan]🎯 LUDO BOARD 🎯[/bold cyan]\n"))
+LEGEND = _highlight(Text.from_markup("\n".join([
+    "\n[bold green]Legend:[/bold green]",
+    "[red]R[/red]/[blue]B[/blue]/[green]G[/green]/[yellow]Y[/yellow] = Home areas",
+    "[white]○[/white] = Regular path",
+    "[bold white]★[/bold white] = Safe spots",
+    "[bold red]△[/bold red]/[bold blue]△[/bold blue]/[bold green]△[/bold green]/[bold yellow]△[/bold yellow] = Finish lanes",
+    "[bold magenta]★[/bold magenta] = Center (finish)",
+    "[bold red]◉[/bold red]/[bold blue]◉[/bold blue]/[bold green]◉[/bold green]/[bold yellow]◉[/bold yellow] = Starting positions",
+    "[bold red]R[/bold red]/[bold blue]B[/bold blue]/[bold green]G[/bold green]/[bold yellow]Y[/bold yellow] = Player tokens",
+])))
+
+
+def token_cells(state: GameState) -> dict[tuple[int, int], str]:
+    """Cells holding a token and the markup drawn there, straight from the occupancy index."""
+    occupancy = state.occupancy
+    cells = {}
+    for pos, cell in RING_CELLS.items():
+        occupants = occupancy[pos]
+        if occupants:
+            # Highest seat on the square is drawn on top
+            cells[cell] = TOKEN_MARKUP[(occupants.bit_length() - 1) // TOKENS_PER_PLAYER]
+    for pos in range(53, 58):
+        occupants = occupancy[pos]
+        if occupants:
+            for seat, mask in enumerate(SEAT_MASKS):
+                if occupants & mask:
+                    cells[LANE_CELLS[seat][pos - 51]] = TOKEN_MARKUP[seat]
+    return cells
+
+
+class BoardRenderer:
+    """Board frames for successive states; ``changed`` counts the cells the last update redrew."""
+
+    def __init__(self):
+        self._cells = [list(row) for row in STATIC_CELLS]
+        self._tokens: dict[tuple[int, int], str] = {}
+        self.rows = [Text.from_markup("".join(row)) for row in self._cells]
+        self.changed = 0
+
+    def update(self, state: GameState) -> None:
+        tokens = token_cells(state)
+        previous = self._tokens
+        dirty = set()
+        changed = 0
+        for r, c in previous.keys() - tokens.keys():
+            self._cells[r][c] = STATIC_CELLS[r][c]
+            dirty.add(r)
+            changed += 1
+        for (r, c), markup in tokens.items():
+            if previous.get((r, c)) != markup:
+                self._cells[r][c] = markup
+                dirty.add(r)
+                changed += 1
+        for r in dirty:
+            self.rows[r] = Text.from_markup("".join(self._cells[r]))
+        self._tokens = tokens
+        self.changed = changed
+
+    def board(self, state: GameState) -> Group:
+        """Title, grid and legend for ``state``, as one renderable."""
+        self.update(state)
+        return Group(TITLE, *self.rows, LEGEND)
+
+
+def status_table(state: GameState) -> Table:
+    """Tokens home, on the ring, in the finish lane and finished, per player."""
+    table = Table(title="Game Status")
+    table.add_column("Player", style="cyan")
+    table.add_column("Tokens Home", style="red")
+    table.add_column("Tokens On Board", style="yellow")
+    table.add_column("Tokens in Finish", style="blue")
+    table.add_column("Tokens Finished", style="green")
+    table.add_column("Consecutive 6s", style="magenta")
+
+    for seat in range(len(PLAYER_NAMES)):
+        tokens = state.player_tokens(seat)
+        home = sum(1 for t in tokens if t == 0)
+        on_board = sum(1 for t in tokens if 0 < t < 51)
+        in_finish = sum(1 for t in tokens if 51 <= t < 57)
+        finished = sum(1 for t in tokens if t == 57)
+        sixes = state.consecutive_sixes[seat]
+
+        table.add_row(PLAYER_NAMES[seat], str(home), str(on_board), str(in_finish), str(finished), str(sixes))
+    return table
+
+
+class LiveBoard:
+    """Board and status repainted in place, one write per :meth:`show`; use as a context manager.
+
+    When the console is not a terminal (a pipe or file) every frame is
+    printed in turn instead.
+    """
+
+    def __init__(self, console: Console, status: bool = True):
+        self.console = console
+        self.renderer = BoardRenderer()
+        self.status = status
+        self._live = Live(console=console, auto_refresh=False) if console.is_terminal else None
+
+    def show(self, state: GameState, caption: Optional[str] = None) -> None:
+        parts = [Text.from_markup(caption)] if caption else []
+        parts.append(self.renderer.board(state))
+        if self.status:
+            parts.append(status_table(state))
+        if self._live is None:
+            self.console.print(Group(*parts))
+        else:
+            self._live.update(Group(*parts), refresh=True)
+
+    def __enter__(self) -> "LiveBoard":
+        if self._live is not None:
+            self._live.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._live is not None:
+            self._live.stop()
@@ -1,6 +1,9 @@
 import os
+import threading
+
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 
 # Load environment variables from .env file
@@ -10,12 +13,58 @@ class Base(DeclarativeBase):
     pass
 
 
+# One engine (and so one connection pool) per database URL
+_engines: dict[str, Engine] = {}
+_engines_lock = threading.Lock()
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, default))
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(int(default))).lower() in ("1", "true", "yes", "on")
+
+
+def _configure_sqlite(dbapi_connection, connection_record):
+    """Per-connection SQLite tuning: WAL, relaxed fsync, bigger cache, wait on locks."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    # Negative cache_size is in KiB rather than pages
+    cursor.execute(f"PRAGMA cache_size=-{_env_int('LUDO_SQLITE_CACHE_KIB', 65536)}")
+    cursor.execute(f"PRAGMA busy_timeout={_env_int('LUDO_SQLITE_BUSY_TIMEOUT_MS', 5000)}")
+    cursor.close()
+
+
+def _create_engine(url: str) -> Engine:
+    if make_url(url).get_backend_name() == "sqlite":
+        engine = create_engine(url, echo=False, future=True)
+        event.listen(engine, "connect", _configure_sqlite)
+        return engine
+
+    # Server databases (Postgres via psycopg): keep a warm, bounded pool
+    return create_engine(
+        url,
+        echo=False,
+        future=True,
+        pool_size=_env_int("LUDO_DB_POOL_SIZE", 10),
+        max_overflow=_env_int("LUDO_DB_MAX_OVERFLOW", 20),
+        pool_timeout=_env_int("LUDO_DB_POOL_TIMEOUT", 30),
+        pool_recycle=_env_int("LUDO_DB_POOL_RECYCLE", 1800),
+        pool_pre_ping=_env_bool("LUDO_DB_POOL_PRE_PING", True),
+    )
+
+
 def get_engine(db_url: str | None = None):
     url = db_url or os.getenv("DATABASE_URL", "sqlite:///ludo.db")
-    return create_engine(url, echo=False, future=True)
+    with _engines_lock:
+        engine = _engines.get(url)
+        if engine is None:
+            engine = _engines[url] = _create_engine(url)
+    return engine
 
 
 def get_session_factory(db_url: str | None = None):
     engine = get_engine(db_url)
     return sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
-
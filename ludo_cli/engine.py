@@ -0,0 +1,440 @@
+"""Headless Ludo rules engine.
+
+Pure game logic only: no console output, no prompts and no database access.
+The terminal front end in ``ludo.py`` (and anything else that wants to play
+games) drives a :class:`GameState` through the functions in this module.
+
+Seats are the integers 0-3 ("Player 1" .. "Player 4"). Positions follow the
+CLI's representation:
+
+- 0 = home
+- 1..52 = ring squares (absolute around the board)
+- 51..57 = player's finish lane steps, 57 being the finish
+"""
+import random
+from array import array
+from typing import NamedTuple, Optional
+
+#  eeh apa we setup players and tokens with player-specific starting positions juu last time movement ilitushinda
+PLAYER_NAMES = ("Player 1", "Player 2", "Player 3", "Player 4")
+PLAYER_COLORS = ("Red", "Blue", "Green", "Yellow")
+PLAYER_LETTERS = ("R", "B", "G", "Y")
+START_POSITIONS = (1, 14, 27, 40)
+FINISH_ENTRIES = (50, 11, 24, 37)
+
+# Safe positions where tokens can't be captured (ka the origi Ludo safe spots)
+SAFE_POSITIONS = frozenset((1, 9, 14, 22, 27, 35, 40, 48))
+
+NUM_PLAYERS = 4
+TOKENS_PER_PLAYER = 4
+NUM_SLOTS = NUM_PLAYERS * TOKENS_PER_PLAYER
+ENCODED_SIZE = NUM_SLOTS + NUM_PLAYERS + 1  # bytes in GameState.to_bytes()
+HOME = 0
+LANE_START = 51
+FINISH = 57
+NUM_POSITIONS = FINISH + 1
+ILLEGAL = 0xFF  # TRANSITIONS entry for a roll that cannot move the token
+
+# Bit mask of one seat's four token slots in GameState.occupancy entries
+SEAT_MASKS = tuple(((1 << TOKENS_PER_PLAYER) - 1) << (p * TOKENS_PER_PLAYER) for p in range(NUM_PLAYERS))
+
+# Zobrist keys: one random 64-bit word per (slot, position), (seat, six
+# streak) and seat to move. A state's hash is the XOR of the words for its
+# features, so each change costs one or two XORs. Fixed seed: hashes are
+# stable across processes and runs.
+_zobrist_rng = random.Random(0x1AD0)
+ZOBRIST_TOKENS = tuple(
+    tuple(_zobrist_rng.getrandbits(64) for _ in range(NUM_POSITIONS)) for _ in range(NUM_SLOTS)
+)
+ZOBRIST_SIXES = tuple(tuple(_zobrist_rng.getrandbits(64) for _ in range(4)) for _ in range(NUM_PLAYERS))
+ZOBRIST_SEAT = tuple(_zobrist_rng.getrandbits(64) for _ in range(NUM_PLAYERS))
+del _zobrist_rng
+
+# Hash of a new game: every token home, no sixes, seat 0 to move
+INITIAL_HASH = ZOBRIST_SEAT[0]
+for _slot in range(NUM_SLOTS):
+    INITIAL_HASH ^= ZOBRIST_TOKENS[_slot][HOME]
+for _player in range(NUM_PLAYERS):
+    INITIAL_HASH ^= ZOBRIST_SIXES[_player][0]
+del _slot, _player
+
+# Hash change when the move passes from seat p to the next seat
+_PASS_KEYS = tuple(ZOBRIST_SEAT[p] ^ ZOBRIST_SEAT[(p + 1) % NUM_PLAYERS] for p in range(NUM_PLAYERS))
+
+
+class Move(NamedTuple):
+    """A single token move for ``player``."""
+
+    player: int
+    token: int
+    old_pos: int
+    new_pos: int
+
+
+class GameState:
+    """Complete state of one game: token positions, seat to move and six streaks.
+
+    Token positions are stored flat in a 16-byte ``bytearray``, indexed by
+    slot ``player * 4 + token``; six streaks live in a 4-byte ``bytearray``.
+    ``to_bytes``/``pack`` give compact encodings for hashing and storage.
+
+    ``occupancy[pos]`` is a bit mask of the slots standing on ``pos`` and
+    ``hash`` is a 64-bit Zobrist hash of the whole state (positions, six
+    streaks, seat to move). Both are derived from the other fields and kept
+    in step by every engine function that changes them, so never write to
+    ``tokens``, ``consecutive_sixes`` or ``current`` directly; use
+    :func:`set_current` and :func:`set_sixes` where the rules functions do
+    not fit.
+    """
+
+    __slots__ = ("tokens", "consecutive_sixes", "current", "occupancy", "hash")
+
+    def __init__(self):
+        self.tokens = bytearray(NUM_SLOTS)
+        self.consecutive_sixes = bytearray(NUM_PLAYERS)
+        self.current = 0
+        self.occupancy = array("H", bytes(2 * NUM_POSITIONS))
+        self.occupancy[HOME] = (1 << NUM_SLOTS) - 1
+        self.hash = INITIAL_HASH
+
+    def _rebuild_occupancy(self) -> None:
+        """Recompute the derived fields (occupancy and hash) from scratch."""
+        occupancy = array("H", bytes(2 * NUM_POSITIONS))
+        for slot, pos in enumerate(self.tokens):
+            occupancy[pos] |= 1 << slot
+        self.occupancy = occupancy
+        self.hash = full_hash(self)
+
+    def player_tokens(self, player: int) -> bytearray:
+        """Copy of one seat's four token positions."""
+        base = player * TOKENS_PER_PLAYER
+        return self.tokens[base:base + TOKENS_PER_PLAYER]
+
+    def copy(self) -> "GameState":
+        clone = GameState.__new__(GameState)
+        clone.tokens = self.tokens[:]
+        clone.consecutive_sixes = self.consecutive_sixes[:]
+        clone.current = self.current
+        clone.occupancy = self.occupancy[:]
+        clone.hash = self.hash
+        return clone
+
+    def to_bytes(self) -> bytes:
+        """21-byte encoding: 16 token positions, 4 six streaks, seat to move."""
+        return bytes(self.tokens) + bytes(self.consecutive_sixes) + bytes((self.current,))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "GameState":
+        if len(data) != ENCODED_SIZE:
+            raise ValueError(f"expected {ENCODED_SIZE} bytes, got {len(data)}")
+        state = cls.__new__(cls)
+        state.tokens = bytearray(data[:NUM_SLOTS])
+        state.consecutive_sixes = bytearray(data[NUM_SLOTS:NUM_SLOTS + NUM_PLAYERS])
+        state.current = data[-1]
+        state._rebuild_occupancy()
+        return state
+
+    def pack(self) -> int:
+        """Pack into one 106-bit integer (6 bits per token, 2 per six streak, 2 for the seat)."""
+        value = self.current
+        for streak in reversed(self.consecutive_sixes):
+            value = (value << 2) | streak
+        for pos in reversed(self.tokens):
+            value = (value << 6) | pos
+        return value
+
+    @classmethod
+    def unpack(cls, value: int) -> "GameState":
+        state = cls()
+        for slot in range(NUM_SLOTS):
+            state.tokens[slot] = value & 0x3F
+            value >>= 6
+        for player in range(NUM_PLAYERS):
+            state.consecutive_sixes[player] = value & 0x3
+            value >>= 2
+        state.current = value & 0x3
+        state._rebuild_occupancy()
+        return state
+
+    def __eq__(self, other):
+        if not isinstance(other, GameState):
+            return NotImplemented
+        return (
+            self.tokens == other.tokens
+            and self.consecutive_sixes == other.consecutive_sixes
+            and self.current == other.current
+        )
+
+    __hash__ = None  # mutable; key dicts by ``state.hash`` (or ``to_bytes()`` for exact keys)
+
+
+def full_hash(state: GameState) -> int:
+    """Zobrist hash computed from scratch; ``state.hash`` is kept equal to it incrementally."""
+    value = ZOBRIST_SEAT[state.current]
+    for slot, pos in enumerate(state.tokens):
+        value ^= ZOBRIST_TOKENS[slot][pos]
+    for player, streak in enumerate(state.consecutive_sixes):
+        value ^= ZOBRIST_SIXES[player][streak]
+    return value
+
+
+def set_current(state: GameState, seat: int) -> None:
+    """Hand the move to ``seat``."""
+    state.hash ^= ZOBRIST_SEAT[state.current] ^ ZOBRIST_SEAT[seat]
+    state.current = seat
+
+
+def set_sixes(state: GameState, player: int, streak: int) -> None:
+    """Set ``player``'s count of consecutive sixes."""
+    sixes = ZOBRIST_SIXES[player]
+    state.hash ^= sixes[state.consecutive_sixes[player]] ^ sixes[streak]
+    state.consecutive_sixes[player] = streak
+
+
+def _step(player: int, current_pos: int, dice_roll: int) -> int:
+    """Reference movement rule; returns ``ILLEGAL`` when the roll cannot move the token.
+
+    Only used to build ``TRANSITIONS`` at import time.
+    """
+    # Entering the board (only a 6 lets a token out)
+    if current_pos == HOME:
+        return START_POSITIONS[player] if dice_roll == 6 else ILLEGAL
+
+    # Already in finish lane
+    if LANE_START <= current_pos <= FINISH:
+        # Must not overshoot final 57
+        target = current_pos + dice_roll
+        return target if target <= FINISH else ILLEGAL
+
+    # On the main ring. Compute steps to the finish entry square clockwise.
+    steps_to_entry = (FINISH_ENTRIES[player] - current_pos) % 52
+    if dice_roll <= steps_to_entry:
+        # Move stays on ring
+        target = current_pos + dice_roll
+        return target if target <= 52 else target - 52
+
+    # Enter the finish lane if possible; overshooting the lane is not a move
+    remaining_into_lane = dice_roll - steps_to_entry - 1
+    if remaining_into_lane <= 6:
+        return LANE_START + remaining_into_lane
+    return ILLEGAL
+
+
+def _build_transitions() -> tuple:
+    return tuple(
+        tuple(
+            bytes(_step(player, pos, dice) if dice else ILLEGAL for pos in range(NUM_POSITIONS))
+            for dice in range(7)
+        )
+        for player in range(NUM_PLAYERS)
+    )
+
+
+def _build_move_table() -> tuple:
+    return tuple(
+        tuple(
+            tuple(
+                tuple(
+                    Move(player, token, pos, new_pos) if new_pos != ILLEGAL else None
+                    for pos, new_pos in enumerate(TRANSITIONS[player][dice])
+                )
+                for token in range(TOKENS_PER_PLAYER)
+            )
+            for dice in range(7)
+        )
+        for player in range(NUM_PLAYERS)
+    )
+
+
+# TRANSITIONS[player][dice][pos] -> new position, or ILLEGAL when the roll
+# cannot move a token standing on ``pos``. Dice 0 (the three-sixes penalty)
+# is a row of ILLEGAL so callers can index with the effective roll directly.
+TRANSITIONS = _build_transitions()
+
+# MOVE_TABLE[player][dice][token][pos] -> prebuilt Move, or None. Derived
+# from TRANSITIONS so move generation and calculate_new_position can never
+# disagree.
+MOVE_TABLE = _build_move_table()
+
+
+def _build_progress() -> tuple:
+    return tuple(
+        bytes(
+            pos if pos >= LANE_START else (pos - START_POSITIONS[player]) % 52 + 1 if pos else 0
+            for pos in range(NUM_POSITIONS)
+        )
+        for player in range(NUM_PLAYERS)
+    )
+
+
+# PROGRESS[player][pos] -> squares travelled from home (0) to the finish (57)
+PROGRESS = _build_progress()
+
+
+def calculate_new_position(player: int, current_pos: int, dice_roll: int) -> int:
+    """Calculate new absolute position respecting per-player finish entry and finish lane.
+
+    Returns ``current_pos`` unchanged when the roll cannot move the token.
+    """
+    new_pos = TRANSITIONS[player][dice_roll][current_pos]
+    return current_pos if new_pos == ILLEGAL else new_pos
+
+
+def legal_moves_for(state: GameState, player: int, dice: int) -> list[Move]:
+    """All moves ``player`` could make with an (effective) dice roll."""
+    by_token = MOVE_TABLE[player][dice]
+    base = player * TOKENS_PER_PLAYER
+    a, b, c, d = state.tokens[base:base + TOKENS_PER_PLAYER]
+    moves = []
+    move = by_token[0][a]
+    if move is not None:
+        moves.append(move)
+    move = by_token[1][b]
+    if move is not None:
+        moves.append(move)
+    move = by_token[2][c]
+    if move is not None:
+        moves.append(move)
+    move = by_token[3][d]
+    if move is not None:
+        moves.append(move)
+    return moves
+
+
+def legal_moves(state: GameState, dice: int) -> list[Move]:
+    """All moves available to the seat to move for an (effective) dice roll."""
+    return legal_moves_for(state, state.current, dice)
+
+
+def get_movable_tokens(state: GameState, player: int, dice: int) -> list[int]:
+    """Get list of tokens that can be moved with the current dice roll"""
+    row = TRANSITIONS[player][dice]
+    base = player * TOKENS_PER_PLAYER
+    a, b, c, d = state.tokens[base:base + TOKENS_PER_PLAYER]
+    movable = []
+    if row[a] != ILLEGAL:
+        movable.append(0)
+    if row[b] != ILLEGAL:
+        movable.append(1)
+    if row[c] != ILLEGAL:
+        movable.append(2)
+    if row[d] != ILLEGAL:
+        movable.append(3)
+    return movable
+
+
+def penalty_move(state: GameState, player: int) -> Optional[Move]:
+    """The move three consecutive 6s would force on ``player``: furthest token home."""
+    tokens = state.player_tokens(player)
+    max_pos = max(tokens)
+    if max_pos == HOME:
+        return None
+    return Move(player, tokens.index(max_pos), max_pos, HOME)
+
+
+def send_home(state: GameState, player: int, token: int) -> None:
+    """Return one token to home, keeping the occupancy index in step."""
+    slot = player * TOKENS_PER_PLAYER + token
+    bit = 1 << slot
+    pos = state.tokens[slot]
+    state.occupancy[pos] &= ~bit
+    state.occupancy[HOME] |= bit
+    state.hash ^= ZOBRIST_TOKENS[slot][pos] ^ ZOBRIST_TOKENS[slot][HOME]
+    state.tokens[slot] = HOME
+
+
+def register_roll(state: GameState, dice: int) -> int:
+    """Track six streaks for the seat to move and apply the three-sixes penalty.
+
+    Returns the effective roll: 0 when three consecutive 6s sent the
+    furthest token home and no move is allowed.
+    """
+    player = state.current
+    streak = state.consecutive_sixes[player]
+    if dice != 6:
+        if streak:
+            set_sixes(state, player, 0)
+        return dice
+
+    if streak < 2:
+        set_sixes(state, player, streak + 1)
+        return dice
+
+    # Third six: find the token that's furthest along and send it home
+    penalty = penalty_move(state, player)
+    if penalty is not None:
+        send_home(state, player, penalty.token)
+    set_sixes(state, player, 0)
+    return 0
+
+
+def occupants(state: GameState, position: int) -> list[tuple[int, int]]:
+    """``(player, token)`` pairs standing on ``position``."""
+    found = []
+    mask = state.occupancy[position]
+    while mask:
+        low = mask & -mask
+        found.append(divmod(low.bit_length() - 1, TOKENS_PER_PLAYER))
+        mask ^= low
+    return found
+
+
+def capture_token(state: GameState, position: int, current_player: int) -> list[tuple[int, int]]:
+    """Send opponent tokens on ``position`` home; returns ``(player, token)`` pairs."""
+    # Skip if position is safe or in finish lane
+    if position in SAFE_POSITIONS or position >= LANE_START:
+        return []
+
+    occupancy = state.occupancy
+    mask = occupancy[position] & ~SEAT_MASKS[current_player]
+    if not mask:
+        return []
+
+    captured = []
+    tokens = state.tokens
+    occupancy[position] ^= mask
+    occupancy[HOME] |= mask
+    while mask:
+        low = mask & -mask
+        slot = low.bit_length() - 1
+        keys = ZOBRIST_TOKENS[slot]
+        state.hash ^= keys[position] ^ keys[HOME]
+        tokens[slot] = HOME
+        captured.append(divmod(slot, TOKENS_PER_PLAYER))
+        mask ^= low
+    return captured
+
+
+def apply_move(state: GameState, move: Move) -> list[tuple[int, int]]:
+    """Move a token and resolve captures; returns the captured ``(player, token)`` pairs."""
+    slot = move.player * TOKENS_PER_PLAYER + move.token
+    bit = 1 << slot
+    keys = ZOBRIST_TOKENS[slot]
+    state.hash ^= keys[move.old_pos] ^ keys[move.new_pos]
+    state.tokens[slot] = move.new_pos
+    occupancy = state.occupancy
+    occupancy[move.old_pos] &= ~bit
+    occupancy[move.new_pos] |= bit
+    if move.new_pos < LANE_START:
+        return capture_token(state, move.new_pos, move.player)
+    return []
+
+
+def end_turn(state: GameState, dice: int, moved: bool) -> None:
+    """Pass the turn on, unless a 6 was rolled and used (which earns another roll)."""
+    if not (dice == 6 and moved):
+        current = state.current
+        state.hash ^= _PASS_KEYS[current]
+        state.current = (current + 1) % NUM_PLAYERS
+
+
+def check_winner(state: GameState, player: int) -> bool:
+    """Check if player has won (all tokens at position 57)"""
+    return all(pos == FINISH for pos in state.player_tokens(player))
+
+
+def winner(state: GameState) -> Optional[int]:
+    for player in range(NUM_PLAYERS):
+        if check_winner(state, player):
+            return player
+    return None
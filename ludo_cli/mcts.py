@@ -0,0 +1,212 @@
+"""Monte Carlo Tree Search bot (UCT) with root-parallel rollouts.
+
+Tree nodes are decision points: a seat to move holding a rolled die. Each
+edge is one of its legal moves followed by the sampled dice of the turns
+after it, so a move's children are keyed by the state (its Zobrist hash)
+and roll that sampling reached. Selection uses UCB1 from the point of view of the seat at
+each node; a rollout plays the game out with a fast policy and credits the
+winning seat.
+
+Searches run in the calling process by default, so bots that already live
+in worker processes (``simulate``, the server's search pool) never nest
+pools. With ``workers > 1`` every worker process grows its own tree from
+the same root with its own seed (root parallelisation) and the root visit
+counts are summed; the most visited move is played. A search is bounded
+by a number of rollouts, a time budget, or both.
+"""
+import atexit
+import math
+import random
+import time
+from typing import Optional
+
+from .engine import (
+    GameState,
+    Move,
+    apply_move,
+    check_winner,
+    end_turn,
+    legal_moves,
+    register_roll,
+)
+from .tablebase import get_tablebase, seat_race
+
+DEFAULT_TIME_BUDGET = 0.2   # seconds per decision
+DEFAULT_EXPLORATION = 1.4
+
+
+class _Node:
+    __slots__ = ("seat", "moves", "visits", "wins", "children", "total")
+
+    def __init__(self, seat: int, moves: list[Move]):
+        self.seat = seat
+        self.moves = moves
+        self.visits = [0] * len(moves)
+        self.wins = [0] * len(moves)
+        self.children: list[dict] = [{} for _ in moves]
+        self.total = 0
+
+    def select(self, exploration: float) -> int:
+        visits = self.visits
+        for index, count in enumerate(visits):
+            if not count:
+                return index
+        log_total = math.log(self.total)
+        wins = self.wins
+        best, best_score = 0, -1.0
+        for index, count in enumerate(visits):
+            score = wins[index] / count + exploration * math.sqrt(log_total / count)
+            if score > best_score:
+                best, best_score = index, score
+        return best
+
+
+def _roll(state: GameState, rng: random.Random) -> tuple[int, list[Move]]:
+    """Roll for the seat to move, passing the turn on until someone can move."""
+    while True:
+        dice = register_roll(state, int(rng.random() * 6) + 1)
+        moves = legal_moves(state, dice)
+        if moves:
+            return dice, moves
+        end_turn(state, dice, False)
+
+
+def _playout(state: GameState, dice: int, moves: list[Move], rng: random.Random, policy) -> int:
+    """Play on from a rolled position to the end; returns the winning seat."""
+    while True:
+        seat = state.current
+        move = moves[0] if len(moves) == 1 else policy.choose(state, dice, moves)
+        apply_move(state, move)
+        if check_winner(state, seat):
+            return seat
+        end_turn(state, dice, True)
+        dice, moves = _roll(state, rng)
+
+
+def uct_search(state: GameState, dice: int, rng: random.Random, rollouts: Optional[int] = None,
+               time_budget: Optional[float] = None, exploration: float = DEFAULT_EXPLORATION,
+               rollout_policy: str = "random") -> tuple[list[int], list[int], int]:
+    """Grow one tree from ``state`` (seat to move holding ``dice``).
+
+    Returns the root's per-move visits and wins (in ``legal_moves`` order)
+    and the number of rollouts played.
+    """
+    from .policies import make_policy  # policies registers this module
+
+    policy = make_policy(rollout_policy, rng)
+    root = _Node(state.current, legal_moves(state, dice))
+    deadline = time.perf_counter() + time_budget if time_budget is not None else None
+    played = 0
+    while (rollouts is None or played < rollouts) and (deadline is None or time.perf_counter() < deadline):
+        sim = state.copy()
+        node, node_dice = root, dice
+        path = []
+        while True:
+            index = node.select(exploration)
+            path.append((node, index))
+            move = node.moves[index]
+            apply_move(sim, move)
+            if check_winner(sim, node.seat):
+                winner = node.seat
+                break
+            end_turn(sim, node_dice, True)
+            next_dice, moves = _roll(sim, rng)
+            if node.visits[index] == 0:
+                winner = _playout(sim, next_dice, moves, rng, policy)
+                break
+            key = (sim.hash, next_dice)
+            child = node.children[index].get(key)
+            if child is None:
+                node.children[index][key] = _Node(sim.current, moves)
+                winner = _playout(sim, next_dice, moves, rng, policy)
+                break
+            node, node_dice = child, next_dice
+
+        for visited, index in path:
+            visited.total += 1
+            visited.visits[index] += 1
+            if visited.seat == winner:
+                visited.wins[index] += 1
+        played += 1
+    return root.visits, root.wins, played
+
+
+def _search_worker(encoded: bytes, dice: int, seed: int, rollouts: Optional[int],
+                   time_budget: Optional[float], exploration: float, rollout_policy: str):
+    return uct_search(GameState.from_bytes(encoded), dice, random.Random(seed), rollouts,
+                      time_budget, exploration, rollout_policy)
+
+
+class MctsPolicy:
+    """UCT bot; ``rollouts`` and/or ``time_budget`` (seconds) bound each decision.
+
+    After each decision ``rollouts_played``, ``elapsed`` and
+    ``rollouts_per_second`` describe the search. Pure races are played from
+    the race tablebase without searching (``use_tablebase``).
+    """
+
+    name = "mcts"
+
+    def __init__(self, rng: random.Random | None = None, rollouts: Optional[int] = None,
+                 time_budget: Optional[float] = DEFAULT_TIME_BUDGET, workers: int = 1,
+                 exploration: float = DEFAULT_EXPLORATION, rollout_policy: str = "random",
+                 use_tablebase: bool = True):
+        self.rng = rng or random.Random()
+        self.use_tablebase = use_tablebase
+        self.rollouts = rollouts
+        self.time_budget = time_budget
+        self.workers = workers
+        self.exploration = exploration
+        self.rollout_policy = rollout_policy
+        self.rollouts_played = 0
+        self.elapsed = 0.0
+        self._pool = None  # ProcessPoolExecutor, started on the first parallel search
+
+    @property
+    def rollouts_per_second(self) -> float:
+        return self.rollouts_played / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def summary(self) -> str:
+        return f"{self.rollouts_played:,} rollouts, {self.rollouts_per_second:,.0f}/sec"
+
+    def choose(self, state: GameState, dice: int, moves: list[Move]) -> Move:
+        if self.rollouts is None and self.time_budget is None:
+            raise ValueError("MctsPolicy needs a rollout or time budget")
+        if self.use_tablebase and seat_race(state, state.current) is not None:
+            # Pure race: the tablebase already knows the best move
+            self.rollouts_played, self.elapsed = 0, 0.0
+            return get_tablebase().best_move(state, dice, moves)
+        started = time.perf_counter()
+        seeds = [int(self.rng.random() * 2 ** 63) for _ in range(self.workers)]
+        if self.workers == 1:
+            results = [uct_search(state, dice, random.Random(seeds[0]), self.rollouts, self.time_budget,
+                                  self.exploration, self.rollout_policy)]
+        else:
+            if self._pool is None:
+                from concurrent.futures import ProcessPoolExecutor  # pulls in multiprocessing
+
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+                atexit.register(self.close)
+            share = -(-self.rollouts // self.workers) if self.rollouts is not None else None
+            encoded = state.to_bytes()
+            futures = [
+                self._pool.submit(_search_worker, encoded, dice, seed, share, self.time_budget,
+                                  self.exploration, self.rollout_policy)
+                for seed in seeds
+            ]
+            results = [future.result() for future in futures]
+
+        root_moves = legal_moves(state, dice)
+        visits = [sum(result[0][index] for result in results) for index in range(len(root_moves))]
+        self.rollouts_played = sum(result[2] for result in results)
+        self.elapsed = time.perf_counter() - started
+        best = root_moves[max(range(len(root_moves)), key=visits.__getitem__)]
+        return next(move for move in moves if move.token == best.token)
+
+    def close(self) -> None:
+        """Shut down the worker pool (also done at interpreter exit)."""
+        if self._pool is not None:
+            atexit.unregister(self.close)
+            self._pool.shutdown()
+            self._pool = None
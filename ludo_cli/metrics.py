@@ -0,0 +1,182 @@
+"""Per-phase turn timings: fixed-bucket histograms and Prometheus text export.
+
+A turn is split into phases (``roll``, ``movegen``, ``select``, ``apply``,
+``render``, ``db_write``; the server adds ``request``) and each phase's
+durations go into a histogram with fixed log-spaced buckets, so recording a
+sample is one ``perf_counter`` call, a bisect and two additions, and
+histograms from worker processes merge by adding counts.
+
+Collection is off until :func:`enable` is called. While it is off,
+:func:`timer` returns a timer whose ``lap`` does nothing and :func:`observe`
+returns at once, so instrumented code costs a method call per phase.
+Histograms are updated without a lock; they are meant to be written from
+one thread each (the game loop, the event loop, a writer thread).
+"""
+import os
+from bisect import bisect_left
+from time import perf_counter
+from typing import Optional
+
+# Upper bucket bounds in seconds: 1, 2.5, 5 per decade from 100 ns to 5 s, then 10 s
+BOUNDS = tuple(m * 10.0 ** e for e in range(-7, 1) for m in (1, 2.5, 5)) + (10.0,)
+PHASES = ("roll", "movegen", "select", "apply", "render", "db_write")
+METRIC = "ludo_phase_seconds"
+
+
+class Histogram:
+    """Sample counts per :data:`BOUNDS` bucket (plus one overflow bucket), sum and maximum."""
+
+    __slots__ = ("counts", "sum", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BOUNDS) + 1)
+        self.sum = 0.0
+        self.max = 0.0
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(BOUNDS, seconds)] += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: "Histogram") -> None:
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the ``q`` quantile (the maximum for the last bucket)."""
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= rank:
+                return min(BOUNDS[index], self.max) if index < len(BOUNDS) else self.max
+        return 0.0
+
+
+class PhaseTimings:
+    """One :class:`Histogram` per phase name, created on first use."""
+
+    def __init__(self):
+        self.histograms: dict[str, Histogram] = {}
+
+    def observe(self, phase: str, seconds: float) -> None:
+        histogram = self.histograms.get(phase)
+        if histogram is None:
+            histogram = self.histograms[phase] = Histogram()
+        histogram.observe(seconds)
+
+    def timer(self) -> "PhaseTimer":
+        return PhaseTimer(self)
+
+    def merge(self, other: "PhaseTimings") -> None:
+        for phase, histogram in other.histograms.items():
+            mine = self.histograms.get(phase)
+            if mine is None:
+                mine = self.histograms[phase] = Histogram()
+            mine.merge(histogram)
+
+    def _ordered(self) -> list[tuple[str, Histogram]]:
+        order = {phase: index for index, phase in enumerate(PHASES)}
+        return sorted(self.histograms.items(), key=lambda item: (order.get(item[0], len(order)), item[0]))
+
+    def to_prometheus(self, metric: str = METRIC) -> str:
+        """Prometheus text exposition of every phase as one histogram family."""
+        lines = [f"# HELP {metric} Time spent in each phase of a turn.", f"# TYPE {metric} histogram"]
+        for phase, histogram in self._ordered():
+            cumulative = 0
+            for bound, count in zip(BOUNDS, histogram.counts):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{phase="{phase}",le="{bound:g}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{phase="{phase}",le="+Inf"}} {histogram.count}')
+            lines.append(f'{metric}_sum{{phase="{phase}"}} {histogram.sum!r}')
+            lines.append(f'{metric}_count{{phase="{phase}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+    def format_table(self) -> str:
+        """Human-readable summary: samples, mean, p50/p99 (bucket bounds), max and total per phase."""
+        lines = [f"{'Phase':<10} {'Count':>10} {'Mean':>10} {'p50':>10} {'p99':>10} {'Max':>10} {'Total':>10}"]
+        for phase, histogram in self._ordered():
+            count = histogram.count
+            lines.append(
+                f"{phase:<10} {count:>10,} {_duration(histogram.sum / count if count else 0.0):>10} "
+                f"{_duration(histogram.quantile(0.5)):>10} {_duration(histogram.quantile(0.99)):>10} "
+                f"{_duration(histogram.max):>10} {_duration(histogram.sum):>10}"
+            )
+        return "\n".join(lines)
+
+
+def _duration(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.1f} us"
+
+
+class PhaseTimer:
+    """Times consecutive phases: each :meth:`lap` records the time since the previous one."""
+
+    __slots__ = ("timings", "last")
+
+    def __init__(self, timings: PhaseTimings):
+        self.timings = timings
+        self.last = perf_counter()
+
+    def lap(self, phase: str) -> None:
+        now = perf_counter()
+        self.timings.observe(phase, now - self.last)
+        self.last = now
+
+    def restart(self) -> None:
+        self.last = perf_counter()
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def lap(self, phase: str) -> None:
+        pass
+
+    def restart(self) -> None:
+        pass
+
+
+NULL_TIMER = _NullTimer()
+
+# Process-wide timings, collected once enable() is called
+TIMINGS = PhaseTimings()
+enabled = False
+
+
+def enable() -> None:
+    global enabled
+    enabled = True
+
+
+def timer():
+    """A :class:`PhaseTimer` on :data:`TIMINGS`, or a no-op timer while collection is off."""
+    return PhaseTimer(TIMINGS) if enabled else NULL_TIMER
+
+
+def observe(phase: str, seconds: float) -> None:
+    if enabled:
+        TIMINGS.observe(phase, seconds)
+
+
+def metric_text(name: str, value: float, help_text: str, kind: str = "gauge") -> str:
+    """One unlabelled sample in Prometheus text format, for values that are not histograms."""
+    return f"# HELP {name} {help_text}\n# TYPE {name} {kind}\n{name} {value}\n"
+
+
+def write_prometheus(path: str, timings: Optional[PhaseTimings] = None) -> None:
+    """Write ``timings`` (default :data:`TIMINGS`) to ``path`` atomically, e.g. for a textfile collector."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        f.write((timings or TIMINGS).to_prometheus())
+    os.replace(tmp, path)
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import String, Integer, DateTime, ForeignKey
+from sqlalchemy import String, Integer, DateTime, ForeignKey, Index, LargeBinary
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .db import Base
@@ -19,18 +19,25 @@ class Player(Base):
 
 class Game(Base):
     __tablename__ = "games"
+    # Covering index for leaderboards: wins per player over finished games
+    __table_args__ = (Index("ix_games_winner_player_id_ended_at", "winner_player_id", "ended_at"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     started_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    ended_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    ended_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, index=True)
     winner_player_id: Mapped[Optional[int]] = mapped_column(ForeignKey("players.id"), nullable=True)
+    # Encoded state after the latest completed turn, rewritten every turn while the game is live
+    checkpoint_turn: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    checkpoint_state: Mapped[Optional[bytes]] = mapped_column(LargeBinary(32), nullable=True)
 
     players: Mapped[list["GamePlayer"]] = relationship(back_populates="game", cascade="all, delete-orphan")
     moves: Mapped[list["Move"]] = relationship(back_populates="game", cascade="all, delete-orphan")
+    snapshots: Mapped[list["GameSnapshot"]] = relationship(back_populates="game", cascade="all, delete-orphan")
 
 
 class GamePlayer(Base):
     __tablename__ = "game_players"
+    __table_args__ = (Index("ix_game_players_game_id_player_id", "game_id", "player_id"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     game_id: Mapped[int] = mapped_column(ForeignKey("games.id"), nullable=False)
@@ -42,6 +49,10 @@ class GamePlayer(Base):
 
 class Move(Base):
     __tablename__ = "moves"
+    __table_args__ = (
+        Index("ix_moves_game_id_turn_index", "game_id", "turn_index"),
+        Index("ix_moves_player_id_game_id", "player_id", "game_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     game_id: Mapped[int] = mapped_column(ForeignKey("games.id"), nullable=False)
@@ -55,3 +66,17 @@ class Move(Base):
 
     game: Mapped[Game] = relationship(back_populates="moves")
 
+
+class GameSnapshot(Base):
+    """Encoded engine state (``GameState.to_bytes()``) after all moves up to ``turn_index``."""
+
+    __tablename__ = "game_snapshots"
+    __table_args__ = (Index("ix_game_snapshots_game_id_turn_index", "game_id", "turn_index", unique=True),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    game_id: Mapped[int] = mapped_column(ForeignKey("games.id"), nullable=False)
+    turn_index: Mapped[int] = mapped_column(Integer, nullable=False)
+    state: Mapped[bytes] = mapped_column(LargeBinary(32), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    game: Mapped[Game] = relationship(back_populates="snapshots")
@@ -0,0 +1,188 @@
+"""Append-only binary move log for bulk simulation.
+
+Each move is one fixed-size little-endian record::
+
+    game_id u32 | turn_index u32 | seat u8 | dice u8 | token_index u8 | old_pos u8 | new_pos u8 | 3 pad
+
+16 bytes per move against ~100+ bytes and tens of microseconds for an ORM
+``Move`` row, so writing is bounded by disk bandwidth. The file starts with
+a 16-byte header (magic, record size); a record cut short by a crash is
+ignored by readers and cut off by the next writer. ``token_index`` is 1-based and ``dice == 0`` marks a
+three-sixes penalty, as in the ``moves`` table.
+
+:func:`read_log` maps the file and returns a NumPy structured array viewing
+the mapping directly (no copy); :func:`import_log` loads a log into the
+``moves`` table when the rows are wanted in the database.
+"""
+import mmap
+import os
+import struct
+from typing import Iterator
+
+RECORD = struct.Struct("<IIBBBBB3x")
+HEADER = struct.Struct("<8sI4x")
+MAGIC = b"LUDOMOVE"
+DEFAULT_BUFFER_BYTES = 1 << 20
+IMPORT_BATCH = 50_000
+
+FIELDS = ("game_id", "turn_index", "seat", "dice", "token_index", "old_pos", "new_pos")
+
+
+def record_dtype():
+    """NumPy dtype matching :data:`RECORD` (padding included, so views need no copy)."""
+    import numpy as np
+
+    return np.dtype({
+        "names": list(FIELDS),
+        "formats": ["<u4", "<u4", "u1", "u1", "u1", "u1", "u1"],
+        "offsets": [0, 4, 8, 9, 10, 11, 12],
+        "itemsize": RECORD.size,
+    })
+
+
+def _check_header(data: bytes, path: str) -> None:
+    magic, size = HEADER.unpack_from(data)
+    if magic != MAGIC or size != RECORD.size:
+        raise ValueError(f"{path} is not a move log")
+
+
+class MoveLogWriter:
+    """Buffered appender for one log file; use as a context manager or call :meth:`close`.
+
+    Records are packed into an in-memory buffer and written with one
+    ``write`` per ``buffer_bytes``. ``last_game_id`` is the game id of the
+    last record already in the file (0 for a new log), so callers appending
+    another run can number their games after it.
+    """
+
+    def __init__(self, path: str, buffer_bytes: int = DEFAULT_BUFFER_BYTES):
+        self.path = path
+        self.buffer_bytes = buffer_bytes
+        self.records = 0
+        self.last_game_id = 0
+        self._file = open(path, "a+b")
+        self._file.seek(0)
+        header = self._file.read(HEADER.size)
+        if header:
+            _check_header(header, path)
+            self.last_game_id = self._drop_partial_record()
+        else:
+            self._file.write(HEADER.pack(MAGIC, RECORD.size))
+        self._buffer = bytearray()
+
+    def _drop_partial_record(self) -> int:
+        """Cut off a record left half-written by a killed run; returns the last game id in the file."""
+        size = self._file.seek(0, os.SEEK_END)
+        whole = HEADER.size + (size - HEADER.size) // RECORD.size * RECORD.size
+        if whole != size:
+            self._file.truncate(whole)
+        if whole == HEADER.size:
+            return 0
+        self._file.seek(whole - RECORD.size)
+        return RECORD.unpack(self._file.read(RECORD.size))[0]
+
+    def record(self, game_id: int, turn_index: int, seat: int, dice: int,
+               token_index: int, old_pos: int, new_pos: int) -> None:
+        self._buffer += RECORD.pack(game_id, turn_index, seat, dice, token_index, old_pos, new_pos)
+        self.records += 1
+        if len(self._buffer) >= self.buffer_bytes:
+            self.flush()
+
+    def write_records(self, data: bytes) -> None:
+        """Append records that were already packed with :data:`RECORD`."""
+        if len(data) % RECORD.size:
+            raise ValueError("data is not a whole number of records")
+        self.flush()
+        self._file.write(data)
+        self.records += len(data) // RECORD.size
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+
+    def __enter__(self) -> "MoveLogWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def read_log(path: str):
+    """Structured array over every complete record, backed by a read-only ``mmap``."""
+    import numpy as np
+
+    dtype = record_dtype()
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < HEADER.size:
+            raise ValueError(f"{path} is not a move log")
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    _check_header(data, path)
+    count = (size - HEADER.size) // RECORD.size
+    return np.frombuffer(data, dtype=dtype, count=count, offset=HEADER.size)
+
+
+def iter_log(path: str, chunk_records: int = IMPORT_BATCH) -> Iterator[tuple]:
+    """Records as plain tuples in :data:`FIELDS` order, without NumPy."""
+    chunk = chunk_records * RECORD.size
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            _check_header(data, path)
+            end = HEADER.size + (len(data) - HEADER.size) // RECORD.size * RECORD.size
+            for offset in range(HEADER.size, end, chunk):
+                yield from RECORD.iter_unpack(data[offset:min(offset + chunk, end)])
+
+
+def import_log(session, path: str, batch_size: int = IMPORT_BATCH) -> dict[int, int]:
+    """Copy a log into ``games``/``moves``; returns log game id -> new ``games.id``.
+
+    Each game in the log becomes a finished ``Game`` row won by the seat of
+    its last move (simulated games always end on the winning move). The log
+    is read twice: once to create the games, once to stream the moves.
+    """
+    from datetime import datetime
+
+    from sqlalchemy import insert
+
+    from .models import Game, Move
+    from .persistence import ensure_players
+
+    player_ids = ensure_players(session)
+    now = datetime.utcnow()
+
+    winners: dict[int, int] = {}
+    for record in iter_log(path):
+        winners[record[0]] = record[2]
+    new_ids = session.scalars(
+        insert(Game).returning(Game.id, sort_by_parameter_order=True),
+        [{"started_at": now, "ended_at": now, "winner_player_id": player_ids[seat]}
+         for seat in winners.values()],
+    ).all() if winners else []
+    game_ids = dict(zip(winners, new_ids))
+
+    rows = []
+    for game_id, turn_index, seat, dice, token_index, old_pos, new_pos in iter_log(path):
+        rows.append({
+            "game_id": game_ids[game_id],
+            "player_id": player_ids[seat],
+            "turn_index": turn_index,
+            "dice": dice,
+            "token_index": token_index,
+            "old_pos": old_pos,
+            "new_pos": new_pos,
+            "created_at": now,
+        })
+        if len(rows) >= batch_size:
+            session.execute(insert(Move), rows)
+            rows.clear()
+    if rows:
+        session.execute(insert(Move), rows)
+    session.commit()
+    return game_ids
@@ -0,0 +1,310 @@
+"""Game and move persistence with buffered bulk inserts.
+
+Player ids are looked up once per game and ``Move`` rows are buffered in
+memory, then written with a single executemany ``INSERT`` every
+``batch_size`` moves, when the game ends and on interpreter shutdown.
+The latest turn checkpoint (see :meth:`MoveRecorder.checkpoint`) is written
+with them as an ``UPDATE`` of the game row.
+
+:class:`BackgroundMoveRecorder` moves the writes off the caller's thread
+entirely: moves go through a bounded queue to a writer thread that commits
+whatever has queued up in one transaction.
+"""
+import atexit
+import queue
+import threading
+import time
+import weakref
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from . import metrics
+from .engine import PLAYER_COLORS, PLAYER_NAMES, GameState
+from .models import Game, GameSnapshot, Move, Player
+
+DEFAULT_BATCH_SIZE = 64
+DEFAULT_QUEUE_SIZE = 10_000
+
+
+def ensure_players(session: Session) -> list[int]:
+    """Create any missing seat players; returns their ids in seat order."""
+    existing = {name: pid for name, pid in session.execute(select(Player.name, Player.id))}
+    missing = [
+        Player(name=name, color=color)
+        for name, color in zip(PLAYER_NAMES, PLAYER_COLORS)
+        if name not in existing
+    ]
+    if missing:
+        session.add_all(missing)
+        session.commit()
+        existing.update((p.name, p.id) for p in missing)
+    return [existing[name] for name in PLAYER_NAMES]
+
+
+class MoveRecorder:
+    """Buffers one game's moves and writes them in bulk.
+
+    Use :meth:`start` to create the game row, :meth:`record` for every move,
+    :meth:`snapshot` every few turns (see :mod:`ludo_cli.replay`),
+    :meth:`checkpoint` after every turn and :meth:`close` (or a ``with``
+    block) when the game is over.
+    """
+
+    def __init__(self, session: Session, game_id: int, player_ids: list[int],
+                 batch_size: int = DEFAULT_BATCH_SIZE):
+        self.session = session
+        self.game_id = game_id
+        self.player_ids = player_ids
+        self.batch_size = batch_size
+        self.closed = False
+        self._buffer: list[dict] = []
+        self._snapshots: list[dict] = []
+        self._checkpoint: list[dict] = []  # the latest one only
+        # Flush whatever is buffered if the interpreter exits before close()
+        self._finalizer = weakref.finalize(self, MoveRecorder._flush_rows, session, self._buffer, self._snapshots,
+                                           self._checkpoint)
+
+    @classmethod
+    def start(cls, session: Session, batch_size: int = DEFAULT_BATCH_SIZE) -> "MoveRecorder":
+        player_ids = ensure_players(session)
+        game = Game(started_at=datetime.utcnow())
+        session.add(game)
+        session.commit()
+        return cls(session, game.id, player_ids, batch_size)
+
+    @classmethod
+    def resume(cls, session: Session, game_id: int, batch_size: int = DEFAULT_BATCH_SIZE) -> "MoveRecorder":
+        """Reopen an interrupted game and keep recording into it."""
+        player_ids = ensure_players(session)
+        game = session.get(Game, game_id)
+        if game is None:
+            raise ValueError(f"game {game_id} does not exist")
+        game.ended_at = None
+        session.commit()
+        return cls(session, game_id, player_ids, batch_size)
+
+    def record(self, seat: int, turn_index: int, dice: int, token_index: int, old_pos: int, new_pos: int) -> None:
+        """Buffer one move; ``token_index`` is 1-based as stored in ``moves``."""
+        self._buffer.append({
+            "game_id": self.game_id,
+            "player_id": self.player_ids[seat],
+            "turn_index": turn_index,
+            "dice": dice,
+            "token_index": token_index,
+            "old_pos": old_pos,
+            "new_pos": new_pos,
+            "created_at": datetime.utcnow(),
+        })
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def snapshot(self, turn_index: int, state: GameState) -> None:
+        """Buffer the encoded state after ``turn_index``; written with the moves before it."""
+        self._snapshots.append(self._snapshot_row(turn_index, state))
+
+    def checkpoint(self, turn_index: int, state: GameState) -> None:
+        """Keep ``state`` after ``turn_index`` as the game's resume point, written with the next flush.
+
+        Unlike moves it covers turns that moved nothing, so the seat to move,
+        six streaks and turn count survive a crash.
+        """
+        self._checkpoint[:] = [self._checkpoint_row(turn_index, state)]
+
+    def _checkpoint_row(self, turn_index: int, state: GameState) -> dict:
+        return {"id": self.game_id, "checkpoint_turn": turn_index, "checkpoint_state": state.to_bytes()}
+
+    def _snapshot_row(self, turn_index: int, state: GameState) -> dict:
+        return {
+            "game_id": self.game_id,
+            "turn_index": turn_index,
+            "state": state.to_bytes(),
+            "created_at": datetime.utcnow(),
+        }
+
+    def flush(self) -> None:
+        MoveRecorder._flush_rows(self.session, self._buffer, self._snapshots, self._checkpoint)
+
+    @staticmethod
+    def _flush_rows(session: Session, rows: list[dict], snapshots: list[dict], checkpoint: list[dict]) -> None:
+        if not rows and not snapshots and not checkpoint:
+            return
+        started = time.perf_counter()
+        if rows:
+            session.execute(insert(Move), rows)
+        if snapshots:
+            session.execute(insert(GameSnapshot), snapshots)
+        if checkpoint:
+            session.execute(update(Game), checkpoint)
+        session.commit()
+        metrics.observe("db_write", time.perf_counter() - started)
+        rows.clear()
+        snapshots.clear()
+        checkpoint.clear()
+
+    def close(self, winner: Optional[int] = None) -> None:
+        """Flush remaining moves and stamp the game as ended (with the winning seat, if any)."""
+        if self.closed:
+            return
+        self.flush()
+        game = self.session.get(Game, self.game_id)
+        if game:
+            game.ended_at = datetime.utcnow()
+            if winner is not None:
+                game.winner_player_id = self.player_ids[winner]
+            self.session.commit()
+        self.closed = True
+        self._finalizer.detach()
+
+    def __enter__(self) -> "MoveRecorder":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+_STOP = object()
+
+
+class BackgroundMoveRecorder(MoveRecorder):
+    """MoveRecorder whose inserts run on a dedicated writer thread.
+
+    ``record`` only enqueues (blocking if ``max_queue`` moves are already
+    waiting). The writer drains up to ``batch_size`` queued moves per
+    transaction using its own session on the same engine. Everything
+    enqueued is written by :meth:`close`, which also runs at interpreter exit.
+    If a write fails, nothing more is written for the game (later rows would
+    leave a gap that replay cannot cross): the writer discards whatever is
+    queued, and the next :meth:`record`, :meth:`snapshot`, :meth:`checkpoint`
+    or :meth:`close` raises ``RuntimeError``.
+    """
+
+    def __init__(self, session: Session, game_id: int, player_ids: list[int],
+                 batch_size: int = DEFAULT_BATCH_SIZE, max_queue: int = DEFAULT_QUEUE_SIZE):
+        super().__init__(session, game_id, player_ids, batch_size)
+        self._finalizer.detach()  # the writer thread owns durability instead
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._writer_session = Session(bind=session.get_bind())
+        self.error: Optional[BaseException] = None
+        self.flushes = 0
+        self.rows_written = 0
+        self.last_flush_seconds = 0.0
+        self.max_flush_seconds = 0.0
+        self.total_flush_seconds = 0.0
+        self._thread = threading.Thread(target=self._run, name=f"move-writer-{game_id}", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    @classmethod
+    def start(cls, session: Session, batch_size: int = DEFAULT_BATCH_SIZE,
+              max_queue: int = DEFAULT_QUEUE_SIZE) -> "BackgroundMoveRecorder":
+        player_ids = ensure_players(session)
+        game = Game(started_at=datetime.utcnow())
+        session.add(game)
+        session.commit()
+        return cls(session, game.id, player_ids, batch_size, max_queue)
+
+    @property
+    def queue_depth(self) -> int:
+        """Moves waiting to be written."""
+        return self._queue.qsize()
+
+    @property
+    def mean_flush_seconds(self) -> float:
+        return self.total_flush_seconds / self.flushes if self.flushes else 0.0
+
+    def _raise_writer_error(self) -> None:
+        if self.error is not None:
+            raise RuntimeError(f"move writer failed for game {self.game_id}: {self.error}") from self.error
+
+    def record(self, seat: int, turn_index: int, dice: int, token_index: int, old_pos: int, new_pos: int) -> None:
+        self._raise_writer_error()
+        self._queue.put((Move, {
+            "game_id": self.game_id,
+            "player_id": self.player_ids[seat],
+            "turn_index": turn_index,
+            "dice": dice,
+            "token_index": token_index,
+            "old_pos": old_pos,
+            "new_pos": new_pos,
+            "created_at": datetime.utcnow(),
+        }))
+
+    def snapshot(self, turn_index: int, state: GameState) -> None:
+        self._raise_writer_error()
+        self._queue.put((GameSnapshot, self._snapshot_row(turn_index, state)))
+
+    def checkpoint(self, turn_index: int, state: GameState) -> None:
+        """Queue the resume point.
+
+        Batches are committed in queue order, so a checkpoint is never
+        stored ahead of the moves before it; a crash between the two only
+        leaves moves that resume replays on top of the previous checkpoint.
+        """
+        self._raise_writer_error()
+        self._queue.put((Game, self._checkpoint_row(turn_index, state)))
+
+    def flush(self) -> None:
+        """Block until every move enqueued so far is committed."""
+        self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            batch = []
+            stop = False
+            item = self._queue.get()
+            while True:
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch and self.error is None:
+                self._write(batch)
+            for _ in range(len(batch) + stop):
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, batch: list[tuple]) -> None:
+        started = time.perf_counter()
+        moves = [row for model, row in batch if model is Move]
+        snapshots = [row for model, row in batch if model is GameSnapshot]
+        checkpoints = [row for model, row in batch if model is Game]
+        try:
+            if moves:
+                self._writer_session.execute(insert(Move), moves)
+            if snapshots:
+                self._writer_session.execute(insert(GameSnapshot), snapshots)
+            if checkpoints:
+                self._writer_session.execute(update(Game), checkpoints[-1:])
+            self._writer_session.commit()
+        except Exception as exc:
+            self._writer_session.rollback()
+            self.error = exc
+            return
+        elapsed = time.perf_counter() - started
+        metrics.observe("db_write", elapsed)
+        self.flushes += 1
+        self.rows_written += len(batch)
+        self.last_flush_seconds = elapsed
+        self.max_flush_seconds = max(self.max_flush_seconds, elapsed)
+        self.total_flush_seconds += elapsed
+
+    def close(self, winner: Optional[int] = None) -> None:
+        """Drain the queue, stop the writer and stamp the game as ended."""
+        if self.closed:
+            return
+        atexit.unregister(self.close)
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._writer_session.close()
+        super().close(winner)
+        self._raise_writer_error()
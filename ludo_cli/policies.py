@@ -0,0 +1,195 @@
+"""Automatic move choosers for headless play and bot seats.
+
+A policy is any object with ``choose(state, dice, legal_moves) -> Move``
+that picks one of the legal moves for the seat to move. Policies are only
+consulted when there is a real choice (two or more legal moves), and must
+not modify ``state``. Move features are read straight from the engine's
+tables and occupancy index, so a decision costs a few microseconds and the
+built-ins are usable inside large simulations and as rollout policies.
+"""
+import random
+
+from .engine import (
+    FINISH,
+    HOME,
+    LANE_START,
+    NUM_PLAYERS,
+    NUM_POSITIONS,
+    PROGRESS,
+    SAFE_POSITIONS,
+    SEAT_MASKS,
+    GameState,
+    Move,
+)
+
+
+def _build_threats() -> tuple:
+    """``THREATS[pos]``: ring squares from which a roll of 1-6 lands on ``pos``."""
+    threats = []
+    for pos in range(NUM_POSITIONS):
+        if pos == HOME or pos >= LANE_START or pos in SAFE_POSITIONS:
+            threats.append(())
+            continue
+        behind = ((pos - back - 1) % 52 + 1 for back in range(1, 7))
+        threats.append(tuple(square for square in behind if square < LANE_START))
+    return tuple(threats)
+
+
+# Approximate: ignores that an opponent may turn into its finish lane first
+THREATS = _build_threats()
+
+
+def capture_count(state: GameState, move: Move) -> int:
+    """Opponent tokens ``move`` would send home."""
+    pos = move.new_pos
+    if pos >= LANE_START or pos in SAFE_POSITIONS:
+        return 0
+    return bin(state.occupancy[pos] & ~SEAT_MASKS[move.player]).count("1")
+
+
+def threatened(state: GameState, pos: int, player: int) -> bool:
+    """Whether an opponent of ``player`` stands 1-6 squares behind ``pos``."""
+    occupancy = state.occupancy
+    enemies = ~SEAT_MASKS[player]
+    for square in THREATS[pos]:
+        if occupancy[square] & enemies:
+            return True
+    return False
+
+
+class RandomPolicy:
+    """Uniformly random legal move."""
+
+    name = "random"
+
+    def __init__(self, rng: random.Random | None = None):
+        self.rng = rng or random.Random()
+
+    def choose(self, state: GameState, dice: int, moves: list[Move]) -> Move:
+        return moves[int(self.rng.random() * len(moves))]
+
+
+class FurthestPolicy:
+    """Always advance the token that is furthest along."""
+
+    name = "furthest"
+
+    def __init__(self, rng: random.Random | None = None):
+        pass
+
+    def choose(self, state: GameState, dice: int, moves: list[Move]) -> Move:
+        progress = PROGRESS[state.current]
+        return max(moves, key=lambda move: progress[move.old_pos])
+
+
+class GreedyPolicy:
+    """Capture if possible, else finish a token, else land safe, else advance furthest."""
+
+    name = "greedy"
+
+    def __init__(self, rng: random.Random | None = None):
+        pass
+
+    def choose(self, state: GameState, dice: int, moves: list[Move]) -> Move:
+        progress = PROGRESS[state.current]
+
+        def key(move: Move):
+            new_pos = move.new_pos
+            return (
+                capture_count(state, move),
+                new_pos == FINISH,
+                new_pos >= LANE_START or new_pos in SAFE_POSITIONS,
+                progress[move.old_pos],
+            )
+
+        return max(moves, key=key)
+
+
+DEFAULT_WEIGHTS = {
+    "progress": 1.0,   # per square advanced
+    "capture": 40.0,   # per opponent token sent home
+    "enter": 25.0,     # bringing a token out of home
+    "finish": 30.0,    # reaching 57
+    "lane": 15.0,      # entering the finish lane, where nothing can be captured
+    "safe": 10.0,      # landing on a safe square
+    "danger": 20.0,    # landing within reach of an opponent
+    "escape": 15.0,    # leaving a square within reach of an opponent
+}
+
+
+class HeuristicPolicy:
+    """Highest weighted sum of move features; see :data:`DEFAULT_WEIGHTS`.
+
+    Ties go to the token that is furthest along.
+    """
+
+    name = "heuristic"
+
+    def __init__(self, rng: random.Random | None = None, weights: dict[str, float] | None = None):
+        self.weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        w = self.weights
+        (self._progress, self._capture, self._enter, self._finish,
+         self._lane, self._safe, self._danger, self._escape) = (
+            w["progress"], w["capture"], w["enter"], w["finish"],
+            w["lane"], w["safe"], w["danger"], w["escape"],
+        )
+
+    def score(self, state: GameState, move: Move) -> float:
+        player, old_pos, new_pos = move.player, move.old_pos, move.new_pos
+        progress = PROGRESS[player]
+        score = (progress[new_pos] - progress[old_pos]) * self._progress + progress[old_pos] * 1e-3
+        if old_pos == HOME:
+            score += self._enter
+        if new_pos == FINISH:
+            score += self._finish
+        elif new_pos >= LANE_START:
+            if old_pos < LANE_START:
+                score += self._lane
+        elif new_pos in SAFE_POSITIONS:
+            score += self._safe
+        else:
+            captured = capture_count(state, move)
+            if captured:
+                score += captured * self._capture
+            if threatened(state, new_pos, player):
+                score -= self._danger
+        if THREATS[old_pos] and threatened(state, old_pos, player):
+            score += self._escape
+        return score
+
+    def choose(self, state: GameState, dice: int, moves: list[Move]) -> Move:
+        return max(moves, key=lambda move: self.score(state, move))
+
+
+# Search bots only import the engine at module level
+from .mcts import MctsPolicy  # noqa: E402
+from .search import ExpectimaxPolicy  # noqa: E402
+
+POLICIES = {
+    cls.name: cls
+    for cls in (RandomPolicy, FurthestPolicy, GreedyPolicy, HeuristicPolicy, ExpectimaxPolicy, MctsPolicy)
+}
+
+
+def make_policy(name: str, rng: random.Random | None = None):
+    try:
+        return POLICIES[name](rng)
+    except KeyError:
+        raise ValueError(f"unknown policy {name!r}; choose from {', '.join(sorted(POLICIES))}") from None
+
+
+def parse_seats(spec: str, extra: tuple[str, ...] = ()) -> list[str]:
+    """Policy name per seat from ``"greedy"`` (every seat) or ``"human,greedy,random,heuristic"``.
+
+    ``extra`` lists further accepted names, such as the CLI's ``human``.
+    """
+    names = [name.strip() for name in spec.split(",")]
+    if len(names) == 1:
+        names *= NUM_PLAYERS
+    if len(names) != NUM_PLAYERS:
+        raise ValueError(f"expected 1 or {NUM_PLAYERS} comma-separated policies, got {len(names)}")
+    for name in names:
+        if name not in POLICIES and name not in extra:
+            choices = ", ".join(sorted([*POLICIES, *extra]))
+            raise ValueError(f"unknown policy {name!r}; choose from {choices}")
+    return names
@@ -0,0 +1,202 @@
+"""Rebuild the board of a stored game at any turn.
+
+Moves are streamed from the ``moves`` table (``yield_per``, so drivers with
+server-side cursors never load a whole game) and applied through the rules
+engine. ``game_snapshots`` holds an encoded ``GameState`` every
+``SNAPSHOT_INTERVAL`` turns, so seeking to turn N replays at most that many
+turns' worth of moves from the nearest snapshot.
+
+Token positions are exact. Rolls that moved nothing are not stored, so the
+seat to move and six streaks after the last snapshot are reconstructed from
+the moves alone and can lag behind the live game.
+"""
+from datetime import datetime
+from typing import Iterator, Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from .engine import (
+    PLAYER_NAMES,
+    TOKENS_PER_PLAYER,
+    GameState,
+    Move,
+    apply_move,
+    end_turn,
+    send_home,
+    set_current,
+    set_sixes,
+)
+from .models import Game, GameSnapshot, Move as MoveModel, Player
+
+SNAPSHOT_INTERVAL = 50
+STREAM_CHUNK = 500
+
+
+class ReplayError(ValueError):
+    """Stored moves do not agree with the rules engine's board."""
+
+
+def seat_map(session: Session) -> dict[int, int]:
+    """``players.id`` -> seat index for the four seat players."""
+    return {
+        pid: PLAYER_NAMES.index(name)
+        for pid, name in session.execute(select(Player.id, Player.name))
+        if name in PLAYER_NAMES
+    }
+
+
+def stream_moves(session: Session, game_id: int, after_turn: int = -1,
+                 upto_turn: Optional[int] = None) -> Iterator:
+    """Stored moves of one game with ``after_turn < turn_index <= upto_turn``, in order."""
+    stmt = (
+        select(
+            MoveModel.player_id, MoveModel.turn_index, MoveModel.dice,
+            MoveModel.token_index, MoveModel.old_pos, MoveModel.new_pos,
+        )
+        .where(MoveModel.game_id == game_id, MoveModel.turn_index > after_turn)
+        .order_by(MoveModel.turn_index, MoveModel.id)
+        .execution_options(yield_per=STREAM_CHUNK)
+    )
+    if upto_turn is not None:
+        stmt = stmt.where(MoveModel.turn_index <= upto_turn)
+    yield from session.execute(stmt)
+
+
+def apply_recorded(state: GameState, seat: int, row, previous_turn: Optional[int] = None) -> None:
+    """Apply one stored move row; ``dice == 0`` rows are three-sixes penalties.
+
+    ``previous_turn`` is the turn index of the row applied before this one.
+    Rolls that moved nothing are not stored, so six streaks are only carried
+    across rows that are consecutive turns of the same seat; any other
+    seat's streak is cleared.
+    """
+    token = row.token_index - 1
+    actual = state.tokens[seat * TOKENS_PER_PLAYER + token]
+    if actual != row.old_pos:
+        raise ReplayError(
+            f"turn {row.turn_index}: {PLAYER_NAMES[seat]} token {row.token_index} "
+            f"is on {actual}, stored move starts from {row.old_pos}"
+        )
+    for other in range(len(PLAYER_NAMES)):
+        if other != seat and state.consecutive_sixes[other]:
+            set_sixes(state, other, 0)
+
+    if row.dice == 0:
+        send_home(state, seat, token)
+        set_sixes(state, seat, 0)
+        set_current(state, seat)
+        end_turn(state, 0, False)
+        return
+
+    streak = state.consecutive_sixes[seat] if row.turn_index - 1 == previous_turn else 0
+    apply_move(state, Move(seat, token, row.old_pos, row.new_pos))
+    set_sixes(state, seat, streak + 1 if row.dice == 6 else 0)
+    set_current(state, seat)
+    end_turn(state, row.dice, True)
+
+
+def nearest_snapshot(session: Session, game_id: int, turn: int) -> Optional[GameSnapshot]:
+    return session.scalars(
+        select(GameSnapshot)
+        .where(GameSnapshot.game_id == game_id, GameSnapshot.turn_index <= turn)
+        .order_by(GameSnapshot.turn_index.desc())
+        .limit(1)
+    ).first()
+
+
+class GameReplayer:
+    """Seekable replay of one stored game.
+
+    Keeps the last reconstructed position, so scrubbing forward only applies
+    the moves in between; seeking backwards restarts from a snapshot.
+    """
+
+    def __init__(self, session: Session, game_id: int):
+        self.session = session
+        self.game_id = game_id
+        self.seats = seat_map(session)
+        self._state: Optional[GameState] = None
+        self._turn = -1
+        self._last_row = -1  # turn of the last move applied to _state, for six streaks
+
+    def seek(self, turn: int) -> GameState:
+        """Board after every stored move with ``turn_index <= turn``."""
+        snapshot = nearest_snapshot(self.session, self.game_id, turn)
+        if self._state is not None and self._turn <= turn and (
+            snapshot is None or snapshot.turn_index <= self._turn
+        ):
+            state, start, previous = self._state, self._turn, self._last_row
+        elif snapshot is not None:
+            state, start = GameState.from_bytes(snapshot.state), snapshot.turn_index
+            previous = start
+        else:
+            state, start, previous = GameState(), -1, -1
+
+        for row in stream_moves(self.session, self.game_id, after_turn=start, upto_turn=turn):
+            apply_recorded(state, self.seats[row.player_id], row, previous)
+            previous = row.turn_index
+
+        self._state, self._turn, self._last_row = state, turn, previous
+        return state.copy()
+
+
+def replay(session: Session, game_id: int, turn: int) -> GameState:
+    """One-off seek: the board of ``game_id`` after turn ``turn``."""
+    return GameReplayer(session, game_id).seek(turn)
+
+
+def build_snapshots(session: Session, game_id: int, every: int = SNAPSHOT_INTERVAL) -> int:
+    """(Re)write snapshots for a stored game in one streaming pass; returns how many."""
+    seats = seat_map(session)
+    session.execute(delete(GameSnapshot).where(GameSnapshot.game_id == game_id))
+    state = GameState()
+    boundary = every - 1
+    rows = []
+    previous = -1
+    for row in stream_moves(session, game_id):
+        while row.turn_index > boundary:
+            rows.append({"game_id": game_id, "turn_index": boundary, "state": state.to_bytes(),
+                         "created_at": datetime.utcnow()})
+            boundary += every
+        apply_recorded(state, seats[row.player_id], row, previous)
+        previous = row.turn_index
+    if rows:
+        session.execute(insert(GameSnapshot), rows)
+    session.commit()
+    return len(rows)
+
+
+def restore_game(session: Session, game_id: int) -> tuple[GameState, int]:
+    """Live state of an unfinished game and the next turn index, for resuming.
+
+    Starts from the game's checkpoint, which the CLI rewrites after every
+    turn (or, for games recorded without one, the latest snapshot), and
+    replays only the moves stored after it, so the cost does not grow with
+    the length of the game. Turns that moved nothing are only in the
+    checkpoint, so it also gives the right seat to move after a crash.
+    """
+    game = session.get(Game, game_id)
+    if game is None:
+        raise ValueError(f"game {game_id} does not exist")
+    if game.winner_player_id is not None:
+        raise ValueError(f"game {game_id} is already finished")
+
+    snapshot = session.scalars(
+        select(GameSnapshot)
+        .where(GameSnapshot.game_id == game_id)
+        .order_by(GameSnapshot.turn_index.desc())
+        .limit(1)
+    ).first()
+    if game.checkpoint_state is not None and (snapshot is None or game.checkpoint_turn >= snapshot.turn_index):
+        state, last_turn = GameState.from_bytes(game.checkpoint_state), game.checkpoint_turn
+    elif snapshot is not None:
+        state, last_turn = GameState.from_bytes(snapshot.state), snapshot.turn_index
+    else:
+        state, last_turn = GameState(), -1
+
+    seats = seat_map(session)
+    for row in stream_moves(session, game_id, after_turn=last_turn):
+        apply_recorded(state, seats[row.player_id], row, last_turn)
+        last_turn = row.turn_index
+    return state, last_turn + 1
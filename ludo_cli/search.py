@@ -0,0 +1,239 @@
+"""Expectimax search over dice chance nodes.
+
+Every turn is a chance node (the six dice faces, equally likely) followed by
+a decision node for the seat to move. With four players a node's value is a
+vector with one score per seat and each seat maximises its own entry
+(max^n), so no seat is assumed to play against any other in particular.
+
+Chance nodes multiply the branching factor by six, so the search is only
+usable with its two companions:
+
+* a bounded transposition table of chance-node values, keyed by the
+  state's incrementally maintained Zobrist hash (token positions, seat to
+  move, six streaks), and
+* a per-move time budget: depths 1, 2, 3, ... are searched in turn and the
+  move from the deepest completed iteration is played.
+"""
+import random
+import time
+from typing import Optional
+
+from .engine import (
+    HOME,
+    LANE_START,
+    NUM_PLAYERS,
+    NUM_POSITIONS,
+    PROGRESS,
+    SAFE_POSITIONS,
+    TOKENS_PER_PLAYER,
+    GameState,
+    Move,
+    apply_move,
+    check_winner,
+    end_turn,
+    legal_moves,
+    register_roll,
+)
+from .tablebase import get_tablebase, seat_race
+
+WIN_SCORE = 1000.0
+DEFAULT_TIME_BUDGET = 0.2   # seconds per decision
+DEFAULT_MAX_DEPTH = 8       # turns looked ahead after the move
+DEFAULT_TABLE_SIZE = 1 << 16
+
+# Bonuses on top of squares travelled: leaving home takes a 6, the finish
+# lane and safe squares cannot be captured
+OUT_BONUS = 20
+LANE_BONUS = 10
+SAFE_BONUS = 3
+
+
+def _build_token_values() -> tuple:
+    return tuple(
+        tuple(
+            0 if pos == HOME else PROGRESS[player][pos] + OUT_BONUS
+            + (LANE_BONUS if pos >= LANE_START else SAFE_BONUS if pos in SAFE_POSITIONS else 0)
+            for pos in range(NUM_POSITIONS)
+        )
+        for player in range(NUM_PLAYERS)
+    )
+
+
+# TOKEN_VALUES[player][pos] -> static worth of one token standing on ``pos``
+TOKEN_VALUES = _build_token_values()
+
+
+def evaluate(state: GameState) -> tuple[float, ...]:
+    """Static value per seat: its tokens' worth minus the opponents' average."""
+    tokens = state.tokens
+    scores = []
+    for player in range(NUM_PLAYERS):
+        values = TOKEN_VALUES[player]
+        base = player * TOKENS_PER_PLAYER
+        scores.append(values[tokens[base]] + values[tokens[base + 1]]
+                      + values[tokens[base + 2]] + values[tokens[base + 3]])
+    total = sum(scores)
+    return tuple(score - (total - score) / (NUM_PLAYERS - 1) for score in scores)
+
+
+def _won(player: int) -> tuple[float, ...]:
+    return tuple(WIN_SCORE if seat == player else -WIN_SCORE / (NUM_PLAYERS - 1) for seat in range(NUM_PLAYERS))
+
+
+WIN_VALUES = tuple(_won(player) for player in range(NUM_PLAYERS))
+
+
+class TranspositionTable:
+    """Fixed number of slots, one entry each, indexed by a 64-bit state hash.
+
+    On a collision the new entry replaces the old one if it was searched at
+    least as deep, or if the old one is left over from an earlier decision
+    (``new_search`` ages everything stored so far). Stored values stay
+    valid across decisions, so aged entries are still used until replaced.
+    The slots (about 1.6 MB at the default size) are allocated by the first
+    :meth:`put`, so bots that never search, or only play races from the
+    tablebase, cost nothing.
+    """
+
+    def __init__(self, size: int = DEFAULT_TABLE_SIZE):
+        self.size = size
+        self._keys: Optional[list] = None
+        self.age = 0
+        self.hits = 0
+        self.stores = 0
+
+    def _allocate(self) -> None:
+        self._keys = [None] * self.size
+        self._values: list = [None] * self.size
+        self._depths = bytearray(self.size)
+        self._ages = [0] * self.size
+
+    def new_search(self) -> None:
+        self.age += 1
+        self.hits = 0
+        self.stores = 0
+
+    def get(self, key: int, depth: int) -> Optional[tuple]:
+        if self._keys is None:
+            return None
+        index = key % self.size
+        if self._keys[index] == key and self._depths[index] >= depth:
+            self.hits += 1
+            return self._values[index]
+        return None
+
+    def put(self, key: int, depth: int, value: tuple) -> None:
+        if self._keys is None:
+            self._allocate()
+        index = key % self.size
+        if self._keys[index] is None or depth >= self._depths[index] or self._ages[index] != self.age:
+            self._keys[index] = key
+            self._values[index] = value
+            self._depths[index] = depth
+            self._ages[index] = self.age
+            self.stores += 1
+
+    def clear(self) -> None:
+        self.__init__(self.size)
+
+
+class _Timeout(Exception):
+    pass
+
+
+class ExpectimaxPolicy:
+    """Depth-limited expectimax with a transposition table and iterative deepening.
+
+    After each decision ``depth``, ``nodes`` and ``table.hits`` describe
+    the search that produced it. Once the seat to move is in a pure race the
+    move comes from the race tablebase instead (``use_tablebase``).
+    """
+
+    name = "expectimax"
+
+    def __init__(self, rng: random.Random | None = None, time_budget: float = DEFAULT_TIME_BUDGET,
+                 max_depth: int = DEFAULT_MAX_DEPTH, table_size: int = DEFAULT_TABLE_SIZE,
+                 use_tablebase: bool = True):
+        self.time_budget = time_budget
+        self.use_tablebase = use_tablebase
+        self.max_depth = max_depth
+        self.table = TranspositionTable(table_size)
+        self.depth = 0
+        self.nodes = 0
+        self._deadline = 0.0
+
+    @property
+    def summary(self) -> str:
+        return f"depth {self.depth}, {self.nodes:,} nodes, {self.table.hits:,} table hits"
+
+    def choose(self, state: GameState, dice: int, moves: list[Move]) -> Move:
+        self.table.new_search()
+        self.nodes = 0
+        self.depth = 0
+        if self.use_tablebase and seat_race(state, state.current) is not None:
+            # Pure race: the tablebase already knows the best move
+            return get_tablebase().best_move(state, dice, moves)
+        self._deadline = time.perf_counter() + self.time_budget
+        seat = state.current
+
+        # Depth 0 (static evaluation) always completes and seeds the move order
+        children = [self._play(state, move, dice) for move in moves]
+        order = sorted(range(len(moves)), key=lambda i: -self._leaf(children[i])[seat])
+        best = order[0]
+        try:
+            for depth in range(1, self.max_depth + 1):
+                values = {i: self._chance(children[i], depth)[seat] for i in order}
+                order.sort(key=lambda i: -values[i])
+                best = order[0]
+                self.depth = depth
+        except _Timeout:
+            pass
+        return moves[best]
+
+    @staticmethod
+    def _play(state: GameState, move: Move, dice: int) -> GameState:
+        child = state.copy()
+        apply_move(child, move)
+        if not check_winner(child, move.player):
+            end_turn(child, dice, True)
+        return child
+
+    @staticmethod
+    def _leaf(state: GameState) -> tuple[float, ...]:
+        seat = state.current
+        return WIN_VALUES[seat] if check_winner(state, seat) else evaluate(state)
+
+    def _chance(self, state: GameState, depth: int) -> tuple[float, ...]:
+        """Value of ``state`` before the seat to move rolls, ``depth`` turns deep."""
+        seat = state.current
+        if check_winner(state, seat):
+            return WIN_VALUES[seat]
+        if depth == 0:
+            return evaluate(state)
+        key = state.hash
+        cached = self.table.get(key, depth)
+        if cached is not None:
+            return cached
+        if time.perf_counter() > self._deadline:
+            raise _Timeout
+        self.nodes += 1
+
+        totals = [0.0] * NUM_PLAYERS
+        for roll in range(1, 7):
+            after_roll = state.copy()
+            dice = register_roll(after_roll, roll)
+            moves = legal_moves(after_roll, dice)
+            if not moves:
+                end_turn(after_roll, dice, False)
+                value = self._chance(after_roll, depth - 1)
+            else:
+                value = None
+                for move in moves:
+                    candidate = self._chance(self._play(after_roll, move, dice), depth - 1)
+                    if value is None or candidate[seat] > value[seat]:
+                        value = candidate
+            for player in range(NUM_PLAYERS):
+                totals[player] += value[player]
+        result = tuple(total / 6 for total in totals)
+        self.table.put(key, depth, result)
+        return result
@@ -0,0 +1,532 @@
+"""Asyncio game server: many concurrent tables in one process.
+
+Clients speak JSON lines over TCP (or a Unix socket). Every request is one
+object with an ``op``; every reply or push is one object with an
+``event``. A table is a small :class:`Table` around a ``GameState``; bot
+seats are played by the built-in policies, human seats by connected
+clients, and every turn has a timer after which the server plays the move
+for the seat with ``fallback_policy``.
+
+Requests::
+
+    {"op": "create", "seats": "human,greedy,greedy,greedy", "turn_timeout": 30}  # or a list of names
+    {"op": "join", "game": 3}                  # optional "seat"
+    {"op": "roll", "game": 3}
+    {"op": "move", "game": 3, "token": 2}      # 1-based, as on the board
+    {"op": "watch", "game": 3}                 # spectate without a seat
+    {"op": "state", "game": 3}
+    {"op": "leave", "game": 3}
+    {"op": "list"} / {"op": "stats"} / {"op": "metrics"}
+
+Pushes to everyone at a table: ``joined``, ``turn``, ``rolled``, ``moved``,
+``timeout``, ``won`` and ``closed``. Tables start once every human seat is
+taken (an all-bot table starts at once, with its creator watching) and are
+dropped when they finish or their last client leaves.
+
+Cheap policies move inline on the event loop. Search bots (anything with a
+``time_budget``) think in one process pool shared by every table: pure-Python
+search would hold the GIL in a thread and stall the event loop. Each worker
+process keeps a single instance per policy name, so a thousand tables with
+expectimax seats share one transposition table per worker rather than
+allocating one per seat.
+
+With :mod:`ludo_cli.metrics` enabled, every turn's roll, move generation,
+bot move selection and apply phases and every request are timed; the
+``metrics`` op and the optional HTTP endpoint return them, with table and
+game counters, in Prometheus text format.
+"""
+import asyncio
+import itertools
+import json
+import logging
+import math
+import os
+import random
+import time
+from collections import deque
+from typing import Optional
+
+from . import metrics
+from .engine import (
+    NUM_PLAYERS,
+    PLAYER_NAMES,
+    GameState,
+    Move,
+    apply_move,
+    check_winner,
+    end_turn,
+    legal_moves,
+    register_roll,
+)
+from .policies import make_policy, parse_seats
+
+DEFAULT_TURN_TIMEOUT = 30.0
+MIN_TURN_TIMEOUT = 0.1
+MAX_TURN_TIMEOUT = 24 * 3600.0
+DEFAULT_BACKLOG = 1024
+DEFAULT_FALLBACK_POLICY = "greedy"
+MAX_LINE = 64 * 1024
+MAX_WRITE_BUFFER = 1 << 20  # drop clients that stop reading
+LATENCY_SAMPLES = 10_000
+
+log = logging.getLogger(__name__)
+
+
+class ProtocolError(ValueError):
+    """A request the server refuses; reported to the client as an ``error`` event."""
+
+
+class Client:
+    """One connection and where it sits, as ``game id -> seat`` (``None`` when watching)."""
+
+    __slots__ = ("writer", "seats", "name")
+
+    def __init__(self, writer: asyncio.StreamWriter, name: str):
+        self.writer = writer
+        self.seats: dict[int, Optional[int]] = {}
+        self.name = name
+
+    def send(self, message: dict) -> None:
+        transport = self.writer.transport
+        if transport.is_closing():
+            return
+        if transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+            transport.abort()
+            return
+        self.writer.write(json.dumps(message, separators=(",", ":")).encode() + b"\n")
+
+
+# Search policies of this worker process, by name, shared by every table it serves
+_worker_policies: dict = {}
+
+
+def _search_choose(name: str, encoded: bytes, dice: int, seed: int) -> tuple[int, float]:
+    """Pick a move in a server worker process; returns the token index and the search time."""
+    policy = _worker_policies.get(name)
+    if policy is None:
+        policy = _worker_policies[name] = make_policy(name)
+        if hasattr(policy, "workers"):
+            policy.workers = 1  # the server's pool is the parallelism
+    if hasattr(policy, "rng"):
+        policy.rng = random.Random(seed)
+    state = GameState.from_bytes(encoded)
+    started = time.perf_counter()
+    move = policy.choose(state, dice, legal_moves(state, dice))
+    return move.token, time.perf_counter() - started
+
+
+class Table:
+    """One hosted game: state, seat owners and the turn in progress."""
+
+    __slots__ = (
+        "server", "id", "state", "seats", "policies", "clients", "watchers", "rng", "turn_timeout",
+        "phase", "dice", "moves", "timer", "turn_index",
+    )
+
+    def __init__(self, server: "GameServer", game_id: int, seats: list[str], turn_timeout: float):
+        self.server = server
+        self.id = game_id
+        self.state = GameState()
+        self.seats = seats
+        self.rng = random.Random()
+        self.policies = [None if name == "human" else make_policy(name, random.Random(self.rng.random()))
+                         for name in seats]
+        self.clients: list[Optional[Client]] = [None] * NUM_PLAYERS
+        self.watchers: set[Client] = set()
+        self.turn_timeout = turn_timeout
+        self.phase = "waiting"  # waiting -> roll -> move (or thinking) -> ... -> over
+        self.dice = 0
+        self.moves: list[Move] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.turn_index = 0
+
+    # -- views -------------------------------------------------------------
+
+    def snapshot(self) -> dict:
+        tokens = self.state.tokens
+        return {
+            "event": "state",
+            "game": self.id,
+            "phase": self.phase,
+            "current": self.state.current,
+            "dice": self.dice,
+            "seats": self.seats,
+            "taken": [client is not None for client in self.clients],
+            "tokens": [list(tokens[p * 4:p * 4 + 4]) for p in range(NUM_PLAYERS)],
+        }
+
+    def broadcast(self, message: dict) -> None:
+        message["game"] = self.id
+        for client in {*self.clients, *self.watchers}:
+            if client is not None:
+                client.send(message)
+
+    def open_seats(self) -> list[int]:
+        return [seat for seat, name in enumerate(self.seats) if name == "human" and self.clients[seat] is None]
+
+    # -- seats -------------------------------------------------------------
+
+    def join(self, client: Client, seat: Optional[int] = None) -> int:
+        free = self.open_seats()
+        if seat is None:
+            if not free:
+                raise ProtocolError(f"game {self.id} has no free human seat")
+            seat = free[0]
+        elif seat not in free:
+            raise ProtocolError(f"seat {seat} of game {self.id} is not a free human seat")
+        self.clients[seat] = client
+        client.seats[self.id] = seat
+        self.broadcast({"event": "joined", "seat": seat, "player": PLAYER_NAMES[seat]})
+        if self.phase == "waiting" and not self.open_seats():
+            self.start_turn()
+        return seat
+
+    def watch(self, client: Client) -> None:
+        if self.id in client.seats:
+            raise ProtocolError(f"already at game {self.id}")
+        self.watchers.add(client)
+        client.seats[self.id] = None
+
+    def leave(self, client: Client) -> None:
+        seat = client.seats.pop(self.id, None)
+        if seat is None:
+            self.watchers.discard(client)
+        else:
+            self.clients[seat] = None
+        if not any(self.clients) and not self.watchers:
+            self.server.drop(self)
+
+    # -- turns -------------------------------------------------------------
+
+    def _cancel_timer(self) -> None:
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+    def _arm_timer(self) -> None:
+        self._cancel_timer()
+        self.timer = self.server.loop.call_later(self.turn_timeout, self._expire)
+
+    def start_turn(self) -> None:
+        self._cancel_timer()
+        self.phase = "roll"
+        self.dice = 0
+        self.moves = []
+        seat = self.state.current
+        self.broadcast({"event": "turn", "seat": seat, "turn": self.turn_index})
+        if self.policies[seat] is not None:
+            self.server.loop.call_soon(self.play_bot_turn)
+        else:
+            self._arm_timer()
+
+    def roll(self) -> None:
+        seat = self.state.current
+        timer = metrics.timer()
+        self.dice = register_roll(self.state, self.rng.randint(1, 6))
+        timer.lap("roll")
+        self.moves = legal_moves(self.state, self.dice)
+        timer.lap("movegen")
+        self.broadcast({"event": "rolled", "seat": seat, "dice": self.dice,
+                        "tokens": [move.token + 1 for move in self.moves]})
+        if not self.moves:
+            self.finish_turn(moved=False)
+        elif len(self.moves) == 1:
+            self.move(self.moves[0])
+        else:
+            self.phase = "move"
+            if self.policies[seat] is None:
+                self._arm_timer()
+
+    def move(self, move: Move) -> None:
+        self._cancel_timer()
+        timer = metrics.timer()
+        captured = apply_move(self.state, move)
+        timer.lap("apply")
+        self.broadcast({
+            "event": "moved", "seat": move.player, "token": move.token + 1,
+            "from": move.old_pos, "to": move.new_pos,
+            "captured": [[player, token + 1] for player, token in captured],
+        })
+        if check_winner(self.state, move.player):
+            self.phase = "over"
+            self.broadcast({"event": "won", "seat": move.player, "player": PLAYER_NAMES[move.player]})
+            self.server.drop(self)
+            return
+        self.finish_turn(moved=True)
+
+    def finish_turn(self, moved: bool) -> None:
+        end_turn(self.state, self.dice, moved)
+        self.turn_index += 1
+        self.start_turn()
+
+    def play_bot_turn(self) -> None:
+        if self.phase != "roll" or self.server.tables.get(self.id) is not self:
+            return
+        policy = self.policies[self.state.current]
+        self.roll()
+        if self.phase != "move":
+            return
+        if hasattr(policy, "time_budget"):
+            self.phase = "thinking"
+            future = self.server.loop.run_in_executor(self.server.search_pool(), _search_choose, policy.name,
+                                                      self.state.to_bytes(), self.dice, self.rng.getrandbits(64))
+            future.add_done_callback(self._bot_decided)
+        else:
+            timer = metrics.timer()
+            move = policy.choose(self.state, self.dice, self.moves)
+            timer.lap("select")
+            self.move(move)
+
+    def _bot_decided(self, future: asyncio.Future) -> None:
+        if self.phase != "thinking" or self.server.tables.get(self.id) is not self:
+            return
+        self.phase = "move"
+        try:
+            token, seconds = future.result()
+            move = next(move for move in self.moves if move.token == token)
+        except Exception:
+            log.exception("game %d: search bot failed, playing the fallback policy", self.id)
+            move = self.server.fallback.choose(self.state, self.dice, self.moves)
+        else:
+            metrics.observe("select", seconds)
+        self.move(move)
+
+    def _expire(self) -> None:
+        self.timer = None
+        if self.phase not in ("roll", "move") or self.server.tables.get(self.id) is not self:
+            return
+        self.broadcast({"event": "timeout", "seat": self.state.current})
+        if self.phase == "roll":
+            self.roll()
+        if self.phase == "move":
+            self.move(self.server.fallback.choose(self.state, self.dice, self.moves))
+
+    def close(self) -> None:
+        self._cancel_timer()
+        if self.phase != "over":
+            self.phase = "over"
+            self.broadcast({"event": "closed"})
+        for client in {*self.clients, *self.watchers}:
+            if client is not None:
+                client.seats.pop(self.id, None)
+
+
+class GameServer:
+    """Hosts every table of one process; see the module docstring for the protocol."""
+
+    def __init__(self, turn_timeout: float = DEFAULT_TURN_TIMEOUT,
+                 fallback_policy: str = DEFAULT_FALLBACK_POLICY, search_workers: Optional[int] = None):
+        self.turn_timeout = turn_timeout
+        self.fallback = make_policy(fallback_policy)
+        self.search_workers = search_workers or os.cpu_count() or 1
+        self._search_pool = None  # ProcessPoolExecutor, started by the first search bot
+        self.tables: dict[int, Table] = {}
+        self.clients: set[Client] = set()
+        self.latencies: deque = deque(maxlen=LATENCY_SAMPLES)
+        self.games_started = 0
+        self.games_finished = 0
+        self._ids = itertools.count(1)
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def search_pool(self):
+        if self._search_pool is None:
+            from concurrent.futures import ProcessPoolExecutor  # pulls in multiprocessing
+
+            self._search_pool = ProcessPoolExecutor(max_workers=self.search_workers)
+        return self._search_pool
+
+    def close(self) -> None:
+        """Stop the search workers; searches still running are abandoned."""
+        if self._search_pool is not None:
+            self._search_pool.shutdown(wait=False, cancel_futures=True)
+            self._search_pool = None
+
+    def drop(self, table: Table) -> None:
+        if self.tables.pop(table.id, None) is not None:
+            if table.phase == "over":
+                self.games_finished += 1
+            table.close()
+
+    def table(self, request: dict) -> Table:
+        try:
+            return self.tables[int(request["game"])]
+        except (KeyError, TypeError, ValueError):
+            raise ProtocolError(f"no such game: {request.get('game')!r}") from None
+
+    def _seat_turn(self, client: Client, table: Table, phase: str) -> None:
+        seat = client.seats.get(table.id)
+        if seat is None:
+            raise ProtocolError(f"not seated at game {table.id}")
+        if table.state.current != seat or table.phase != phase:
+            raise ProtocolError(f"not your {phase} (seat {table.state.current} to {table.phase})")
+
+    def handle(self, client: Client, request: dict) -> Optional[dict]:
+        """Apply one request; returns the direct reply, if any."""
+        op = request.get("op")
+        if op == "create":
+            spec = request.get("seats", "human,random,random,random")
+            if isinstance(spec, list) and all(isinstance(name, str) for name in spec):
+                spec = ",".join(spec)
+            if not isinstance(spec, str):
+                raise ProtocolError("seats must be a comma-separated string or a list of policy names")
+            try:
+                seats = parse_seats(spec, extra=("human",))
+            except ValueError as exc:
+                raise ProtocolError(str(exc)) from None
+            timeout = float(request.get("turn_timeout", self.turn_timeout))
+            if not (math.isfinite(timeout) and MIN_TURN_TIMEOUT <= timeout <= MAX_TURN_TIMEOUT):
+                raise ProtocolError(f"turn_timeout must be between {MIN_TURN_TIMEOUT:g} and "
+                                    f"{MAX_TURN_TIMEOUT:g} seconds")
+            table = Table(self, next(self._ids), seats, timeout)
+            self.tables[table.id] = table
+            self.games_started += 1
+            client.send({"event": "created", "game": table.id, "seats": seats})
+            if "human" in seats:
+                table.join(client)
+            else:
+                table.watch(client)
+                table.start_turn()
+            return None
+        if op == "join":
+            table = self.table(request)
+            seat = request.get("seat")
+            table.join(client, None if seat is None else int(seat))
+            return table.snapshot()
+        if op == "watch":
+            table = self.table(request)
+            table.watch(client)
+            return table.snapshot()
+        if op == "roll":
+            table = self.table(request)
+            self._seat_turn(client, table, "roll")
+            table.roll()
+            return None
+        if op == "move":
+            table = self.table(request)
+            self._seat_turn(client, table, "move")
+            token = request.get("token")
+            for move in table.moves:
+                if move.token + 1 == token:
+                    table.move(move)
+                    return None
+            raise ProtocolError(f"token {token!r} cannot move; choose from {[m.token + 1 for m in table.moves]}")
+        if op == "state":
+            return self.table(request).snapshot()
+        if op == "leave":
+            self.table(request).leave(client)
+            return {"event": "left", "game": request.get("game")}
+        if op == "list":
+            return {"event": "games", "games": [
+                {"game": table.id, "seats": table.seats, "open": table.open_seats()}
+                for table in self.tables.values() if table.open_seats()
+            ]}
+        if op == "stats":
+            return {"event": "stats", **self.stats()}
+        if op == "metrics":
+            return {"event": "metrics", "text": self.metrics_text()}
+        raise ProtocolError(f"unknown op {op!r}")
+
+    def stats(self) -> dict:
+        samples = sorted(self.latencies)
+
+        def percentile(q: float) -> float:
+            return samples[min(len(samples) - 1, int(q * len(samples)))] * 1000 if samples else 0.0
+
+        return {
+            "tables": len(self.tables),
+            "clients": len(self.clients),
+            "games_started": self.games_started,
+            "games_finished": self.games_finished,
+            "latency_ms": {"p50": percentile(0.50), "p99": percentile(0.99), "max": percentile(1.0)},
+        }
+
+    def metrics_text(self) -> str:
+        """Phase histograms and server counters in Prometheus text format."""
+        return metrics.TIMINGS.to_prometheus() + "".join([
+            metrics.metric_text("ludo_tables", len(self.tables), "Tables being played or waiting for players."),
+            metrics.metric_text("ludo_clients", len(self.clients), "Connected clients."),
+            metrics.metric_text("ludo_games_started_total", self.games_started, "Games started.", "counter"),
+            metrics.metric_text("ludo_games_finished_total", self.games_finished, "Games won.", "counter"),
+        ])
+
+    async def serve_metrics(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Minimal HTTP responder for Prometheus scrapes: any request gets the metrics."""
+        try:
+            while (await reader.readline()).strip():
+                pass  # request line and headers
+            body = self.metrics_text().encode()
+            writer.write(b"HTTP/1.0 200 OK\r\nContent-Type: text/plain; version=0.0.4\r\n"
+                         b"Content-Length: %d\r\n\r\n" % len(body) + body)
+            await writer.drain()
+        except (ConnectionError, ValueError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        peer = writer.get_extra_info("peername")
+        client = Client(writer, str(peer))
+        self.clients.add(client)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    client.send({"event": "error", "message": f"line longer than {MAX_LINE} bytes"})
+                    break
+                except ConnectionError:
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                started = time.perf_counter()
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ProtocolError("requests are JSON objects")
+                    reply = self.handle(client, request)
+                except (ValueError, TypeError) as exc:  # ProtocolError, bad JSON, bad field types
+                    reply = {"event": "error", "message": str(exc)}
+                except Exception as exc:  # a bug in one request must not drop the connection
+                    reply = {"event": "error", "message": f"internal error: {type(exc).__name__}: {exc}"}
+                if reply is not None:
+                    client.send(reply)
+                elapsed = time.perf_counter() - started
+                self.latencies.append(elapsed)
+                metrics.observe("request", elapsed)
+        finally:
+            self.clients.discard(client)
+            for game_id in list(client.seats):
+                table = self.tables.get(game_id)
+                if table is not None:
+                    table.leave(client)
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765, unix_path: Optional[str] = None,
+                    backlog: int = DEFAULT_BACKLOG):
+        """Listen for clients; ``backlog`` bounds connections waiting to be accepted during a burst."""
+        self.loop = asyncio.get_running_loop()
+        if unix_path:
+            return await asyncio.start_unix_server(self.serve_client, path=unix_path, limit=MAX_LINE,
+                                                   backlog=backlog)
+        return await asyncio.start_server(self.serve_client, host, port, limit=MAX_LINE, backlog=backlog)
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8765, unix_path: Optional[str] = None,
+                turn_timeout: float = DEFAULT_TURN_TIMEOUT, metrics_port: Optional[int] = None,
+                backlog: int = DEFAULT_BACKLOG, search_workers: Optional[int] = None) -> None:
+    """Run a server until cancelled; with ``metrics_port`` also answer Prometheus scrapes on ``host``."""
+    server = GameServer(turn_timeout, search_workers=search_workers)
+    listener = await server.start(host, port, unix_path, backlog)
+    try:
+        if metrics_port is not None:
+            metrics.enable()
+            scrapes = await asyncio.start_server(server.serve_metrics, host, metrics_port)
+            async with listener, scrapes:
+                await asyncio.gather(listener.serve_forever(), scrapes.serve_forever())
+        else:
+            async with listener:
+                await listener.serve_forever()
+    finally:
+        server.close()
@@ -0,0 +1,225 @@
+"""Headless batch simulation: complete games with automatic move choice.
+
+No prompts and no rendering; games are driven straight through the rules
+engine and only summary statistics are kept.
+
+Runs are split into fixed-size chunks, each seeded from the master seed
+and its chunk index. Chunks are the unit of work for the process pool, so
+a given ``(games, seed, chunk_size)`` produces identical statistics no
+matter how many workers play it.
+
+With ``move_log`` every move is also appended to a binary move log (see
+:mod:`ludo_cli.movelog`); workers pack their chunk's records and the parent
+writes them in chunk order, so the file is reproducible as well.
+"""
+import hashlib
+import os
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from .engine import (
+    GameState,
+    NUM_PLAYERS,
+    PLAYER_NAMES,
+    apply_move,
+    check_winner,
+    end_turn,
+    legal_moves,
+    penalty_move,
+    register_roll,
+)
+from .metrics import PhaseTimings
+from .movelog import RECORD, MoveLogWriter
+from .policies import make_policy, parse_seats
+
+DEFAULT_CHUNK_SIZE = 250
+
+
+@dataclass
+class GameResult:
+    winner: int
+    turns: int
+    captures: list[int]
+
+
+@dataclass
+class SimulationStats:
+    games: int = 0
+    turns: int = 0
+    wins: list[int] = field(default_factory=lambda: [0] * NUM_PLAYERS)
+    captures: list[int] = field(default_factory=lambda: [0] * NUM_PLAYERS)
+    elapsed: float = 0.0
+    seed: int | None = None
+    timings: Optional[PhaseTimings] = None
+
+    def add(self, result: GameResult) -> None:
+        self.games += 1
+        self.turns += result.turns
+        self.wins[result.winner] += 1
+        for seat, count in enumerate(result.captures):
+            self.captures[seat] += count
+
+    def merge(self, other: "SimulationStats") -> None:
+        self.games += other.games
+        self.turns += other.turns
+        for seat in range(NUM_PLAYERS):
+            self.wins[seat] += other.wins[seat]
+            self.captures[seat] += other.captures[seat]
+        if other.timings is not None:
+            if self.timings is None:
+                self.timings = PhaseTimings()
+            self.timings.merge(other.timings)
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def average_length(self) -> float:
+        return self.turns / self.games if self.games else 0.0
+
+
+def play_game(rng: random.Random, policies, log: bytearray | None = None, game_id: int = 0,
+              timings: Optional[PhaseTimings] = None) -> GameResult:
+    """Play one complete game; ``policies`` holds one policy per seat.
+
+    With ``log`` every move (and three-sixes penalty) is appended to it as a
+    packed move-log record for ``game_id``. With ``timings`` the roll, move
+    generation, move selection and apply phases of every turn are timed into it.
+    """
+    state = GameState()
+    roll = rng.random
+    pack = RECORD.pack
+    lap = timings.timer().lap if timings is not None else None
+    turns = 0
+    captures = [0] * NUM_PLAYERS
+    while True:
+        penalty = None
+        if log is not None and state.consecutive_sixes[state.current] == 2:
+            penalty = penalty_move(state, state.current)
+        dice = register_roll(state, int(roll() * 6) + 1)
+        if lap:
+            lap("roll")
+        moves = legal_moves(state, dice)
+        if lap:
+            lap("movegen")
+        turns += 1
+        if moves:
+            seat = state.current
+            move = moves[0] if len(moves) == 1 else policies[seat].choose(state, dice, moves)
+            if lap:
+                lap("select")
+            captured = apply_move(state, move)
+            if lap:
+                lap("apply")
+            if captured:
+                captures[seat] += len(captured)
+            if log is not None:
+                log += pack(game_id, turns - 1, seat, dice, move.token + 1, move.old_pos, move.new_pos)
+            if check_winner(state, seat):
+                return GameResult(seat, turns, captures)
+        elif penalty is not None and dice == 0:
+            log += pack(game_id, turns - 1, penalty.player, 0, penalty.token + 1, penalty.old_pos, 0)
+        end_turn(state, dice, bool(moves))
+
+
+def run_games(games: int, seed: int | None, policy: str = "random",
+              log: bytearray | None = None, first_game_id: int = 1, timed: bool = False) -> SimulationStats:
+    """Play ``games`` games in this process with ``policy`` (one name, or one per seat).
+
+    Moves go to ``log`` (if given) under game ids counting up from ``first_game_id``.
+    With ``timed`` the returned stats carry per-phase turn timings.
+    """
+    rng = random.Random(seed)
+    policies = [make_policy(name, random.Random(rng.random())) for name in parse_seats(policy)]
+    stats = SimulationStats(timings=PhaseTimings() if timed else None)
+    for game_id in range(first_game_id, first_game_id + games):
+        stats.add(play_game(rng, policies, log, game_id, stats.timings))
+    return stats
+
+
+def chunk_seed(master_seed: int, index: int) -> int:
+    """Seed for chunk ``index``; independent of which worker plays it."""
+    digest = hashlib.blake2b(f"{master_seed}:{index}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def run_chunk(index: int, games: int, master_seed: int, policy: str,
+              first_game_id: int | None = None, timed: bool = False) -> tuple[SimulationStats, bytearray | None]:
+    """Play one chunk; with ``first_game_id`` also return its packed move-log records."""
+    log = bytearray() if first_game_id is not None else None
+    stats = run_games(games, chunk_seed(master_seed, index), policy, log, first_game_id or 1, timed)
+    return stats, log
+
+
+def simulate(games: int, seed: int | None = None, workers: int | None = None, policy: str = "random",
+             chunk_size: int = DEFAULT_CHUNK_SIZE, move_log: str | None = None,
+             timed: bool = False) -> SimulationStats:
+    """Play ``games`` games in chunks across ``workers`` processes (default: all cores).
+
+    Without a ``seed`` one is drawn from the OS and recorded on the returned
+    stats so the run can be reproduced. With ``move_log`` every move is
+    appended to that file, games numbered in chunk order after the last
+    game already in it (from 1 for a new file). With
+    ``timed`` every worker times its turns by phase and ``stats.timings``
+    holds the merged histograms.
+    """
+    parse_seats(policy)  # fail fast on an unknown name
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    if seed is None:
+        seed = random.SystemRandom().randrange(2 ** 32)
+    workers = workers or os.cpu_count() or 1
+    full, rest = divmod(games, chunk_size)
+    sizes = [chunk_size] * full + ([rest] if rest else [])
+
+    started = time.perf_counter()
+    stats = SimulationStats(timings=PhaseTimings() if timed else None)
+    writer = MoveLogWriter(move_log) if move_log else None
+
+    def first_id(index: int) -> int | None:
+        return writer.last_game_id + index * chunk_size + 1 if writer else None
+
+    try:
+        if workers == 1 or len(sizes) <= 1:
+            results = (run_chunk(index, size, seed, policy, first_id(index), timed)
+                       for index, size in enumerate(sizes))
+            for chunk_stats, records in results:
+                stats.merge(chunk_stats)
+                if writer:
+                    writer.write_records(records)
+        else:
+            from concurrent.futures import ProcessPoolExecutor  # pulls in multiprocessing
+
+            with ProcessPoolExecutor(max_workers=min(workers, len(sizes))) as pool:
+                futures = [pool.submit(run_chunk, index, size, seed, policy, first_id(index), timed)
+                           for index, size in enumerate(sizes)]
+                # In submission order, so the move log is written chunk by chunk
+                for future in futures:
+                    chunk_stats, records = future.result()
+                    stats.merge(chunk_stats)
+                    if writer:
+                        writer.write_records(records)
+    finally:
+        if writer:
+            writer.close()
+    stats.elapsed = time.perf_counter() - started
+    stats.seed = seed
+    return stats
+
+
+def format_report(stats: SimulationStats) -> str:
+    lines = [
+        f"Games played:     {stats.games}",
+        f"Seed:             {stats.seed}",
+        f"Elapsed:          {stats.elapsed:.2f}s ({stats.games_per_second:,.0f} games/sec)",
+        f"Average length:   {stats.average_length:.1f} turns",
+        "",
+        f"{'Seat':<10} {'Wins':>8} {'Win rate':>9} {'Captures':>9}",
+    ]
+    for seat, name in enumerate(PLAYER_NAMES):
+        rate = stats.wins[seat] / stats.games if stats.games else 0.0
+        lines.append(f"{name:<10} {stats.wins[seat]:>8} {rate:>9.1%} {stats.captures[seat]:>9}")
+    return "\n".join(lines)
@@ -0,0 +1,124 @@
+"""Spectator mode: bots play a game while a separate thread draws it.
+
+The game loop never waits on the terminal. After each turn it hands a copy
+of the state to a :class:`ThrottledView`, which keeps only the newest frame;
+a render thread wakes at most ``fps`` times a second and draws whatever is
+newest, so frames a slow terminal cannot keep up with are dropped rather
+than queued. ``every`` limits frames to every Nth turn, ``end_only`` to the
+final position.
+"""
+import random
+import threading
+import time
+from typing import Optional
+
+from . import metrics
+from .engine import (
+    PLAYER_NAMES,
+    GameState,
+    apply_move,
+    check_winner,
+    end_turn,
+    legal_moves,
+    register_roll,
+)
+
+DEFAULT_FPS = 10.0
+
+
+class ThrottledView:
+    """Latest-frame-wins hand-off from the game loop to a render thread drawing on ``board``.
+
+    ``board`` is anything with ``show(state, caption)`` (a
+    :class:`~ludo_cli.board.LiveBoard`). ``fps=0`` draws as fast as the
+    terminal allows. ``drawn`` and ``dropped`` count frames after :meth:`close`.
+    """
+
+    def __init__(self, board, fps: float = DEFAULT_FPS, every: int = 1, end_only: bool = False):
+        self.board = board
+        self.interval = 1.0 / fps if fps else 0.0
+        self.every = max(1, every)
+        self.end_only = end_only
+        self.drawn = 0
+        self.dropped = 0
+        self._frame: Optional[tuple[GameState, str]] = None
+        self._closed = False
+        self._wake = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="ludo-render", daemon=True)
+        self._thread.start()
+
+    def publish(self, state: GameState, turn: int, caption: str, final: bool = False) -> None:
+        """Offer the position after ``turn``; returns at once whatever the terminal is doing."""
+        if not final and (self.end_only or turn % self.every):
+            return
+        with self._wake:
+            if self._frame is not None:
+                self.dropped += 1
+            self._frame = (state.copy(), caption)
+            self._wake.notify()
+
+    def _run(self) -> None:
+        next_draw = 0.0
+        while True:
+            with self._wake:
+                while self._frame is None and not self._closed:
+                    self._wake.wait()
+                if self._frame is None:
+                    return
+                # Hold off until the frame interval has passed; newer frames replace this one meanwhile
+                delay = next_draw - time.perf_counter()
+                if delay > 0 and not self._closed:
+                    self._wake.wait(delay)
+                    continue
+                frame, self._frame = self._frame, None
+            started = time.perf_counter()
+            self.board.show(*frame)
+            metrics.observe("render", time.perf_counter() - started)
+            self.drawn += 1
+            next_draw = time.perf_counter() + self.interval
+
+    def close(self) -> None:
+        """Draw the last frame offered and stop the render thread."""
+        with self._wake:
+            self._closed = True
+            self._wake.notify()
+        self._thread.join()
+
+
+def autoplay(policies, view: ThrottledView, rng: Optional[random.Random] = None,
+             turn_delay: float = 0.0) -> tuple[int, int]:
+    """Play one game with a bot in every seat, publishing each turn to ``view``.
+
+    ``turn_delay`` (seconds) paces the game for watching; the default plays
+    at full speed. Returns the winning seat and the number of turns.
+    """
+    rng = rng or random.Random()
+    state = GameState()
+    turn = 0
+    while True:
+        timer = metrics.timer()
+        seat = state.current
+        dice = register_roll(state, rng.randint(1, 6))
+        timer.lap("roll")
+        moves = legal_moves(state, dice)
+        timer.lap("movegen")
+        turn += 1
+        if moves:
+            move = moves[0] if len(moves) == 1 else policies[seat].choose(state, dice, moves)
+            timer.lap("select")
+            captured = apply_move(state, move)
+            timer.lap("apply")
+            caption = (f"Turn {turn}: {PLAYER_NAMES[seat]} rolled {dice}, "
+                       f"token {move.token + 1} {move.old_pos} → {move.new_pos}"
+                       + (" (capture)" if captured else ""))
+            if check_winner(state, seat):
+                view.publish(state, turn, f"[bold green]{caption} — {PLAYER_NAMES[seat]} wins![/bold green]",
+                             final=True)
+                return seat, turn
+        else:
+            caption = f"Turn {turn}: {PLAYER_NAMES[seat]} rolled {dice}, no move" if dice else \
+                f"Turn {turn}: {PLAYER_NAMES[seat]} rolled three sixes, penalty"
+        end_turn(state, dice, bool(moves))
+        view.publish(state, turn, caption)
+        if turn_delay:
+            time.sleep(turn_delay)
@@ -0,0 +1,252 @@
+"""Race-endgame tablebase: exact turns-to-finish for tokens in the finish lane.
+
+Tokens on 51-57 can no longer be captured and move independently of every
+other seat, so once none of a seat's tokens is at home or on the ring its
+future only depends on its own dice. A seat's race is identified by the
+multiset of its unfinished lane positions (51-56): 210 configurations for
+four tokens. For each one the generator stores
+
+* the expected number of turns to bring every token home under the play
+  that minimises it (a 6 that moves a token rolls again, a token must land
+  exactly on 57), and
+* the distribution of that number as a CDF over ``HORIZON`` turns.
+
+Win probabilities for a position where every seat is racing follow from
+the seats' independent CDFs and the turn order. The three-sixes penalty is
+ignored (it sends the furthest token back to the ring, ending the race, on
+under 1% of turns), so values are exact for the rules without it.
+
+The table is a small binary file, built on first use and read through a
+read-only ``mmap`` that is opened lazily once per process: worker pools
+share the pages instead of each holding a copy.
+"""
+import itertools
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from typing import Optional
+
+from .engine import (
+    FINISH,
+    LANE_START,
+    NUM_PLAYERS,
+    TOKENS_PER_PLAYER,
+    GameState,
+    Move,
+)
+
+MAGIC = b"LUDORACE"
+VERSION = 1
+HORIZON = 64  # turns covered by each CDF
+HEADER = struct.Struct("<8sIII")  # magic, version, configurations, horizon
+
+# Every multiset of up to four unfinished lane positions, as sorted tuples
+CONFIGS = tuple(
+    config
+    for size in range(TOKENS_PER_PLAYER + 1)
+    for config in itertools.combinations_with_replacement(range(LANE_START, FINISH), size)
+)
+INDEX = {config: index for index, config in enumerate(CONFIGS)}
+RECORD = struct.Struct(f"<{1 + HORIZON}f")  # expected turns, then P(done within t turns) for t = 1..HORIZON
+
+
+def _moved(config: tuple, slot: int, dice: int) -> tuple:
+    """Configuration after the token at ``config[slot]`` moves ``dice`` squares."""
+    target = config[slot] + dice
+    rest = config[:slot] + config[slot + 1:]
+    return rest if target == FINISH else tuple(sorted(rest + (target,)))
+
+
+def _options(config: tuple, dice: int) -> list[tuple]:
+    """Distinct configurations reachable with ``dice`` (tokens on one square are interchangeable)."""
+    return list({_moved(config, slot, dice) for slot in range(len(config)) if config[slot] + dice <= FINISH})
+
+
+def generate() -> tuple[list[float], list[list[float]]]:
+    """Expected turns and per-turn CDF for every configuration in :data:`CONFIGS`."""
+    # Configurations in order of pips left, so every move leads to one already solved
+    order = sorted(CONFIGS, key=lambda config: sum(FINISH - pos for pos in config))
+    expected: dict[tuple, float] = {(): 0.0}
+    best: dict[tuple, dict[int, tuple]] = {}
+
+    def outcome(after: tuple, dice: int) -> float:
+        """Turns still to play, counting the current one, after moving to ``after``."""
+        if not after:
+            return 1.0
+        return expected[after] if dice == 6 else 1.0 + expected[after]
+
+    for config in order:
+        if not config:
+            continue
+        choices, blocked, total = {}, 0, 0.0
+        for dice in range(1, 7):
+            options = _options(config, dice)
+            if not options:
+                blocked += 1
+                continue
+            after = min(options, key=lambda option: outcome(option, dice))
+            choices[dice] = after
+            total += outcome(after, dice)
+        # A blocked roll ends the turn in the same configuration: E = (sum + blocked * (1 + E)) / 6
+        expected[config] = (total + blocked) / (6 - blocked)
+        best[config] = choices
+
+    # Distribution of where one turn (including rolls after sixes) ends
+    turn_ends: dict[tuple, dict[tuple, float]] = {}
+
+    def roll_on(config: tuple, weight: float, ends: dict) -> None:
+        for dice in range(1, 7):
+            after = best[config].get(dice)
+            if after is None:
+                ends[config] = ends.get(config, 0.0) + weight / 6
+            elif dice == 6 and after:
+                roll_on(after, weight / 6, ends)
+            else:
+                ends[after] = ends.get(after, 0.0) + weight / 6
+
+    for config in order[1:]:
+        ends: dict[tuple, float] = {}
+        roll_on(config, 1.0, ends)
+        turn_ends[config] = ends
+
+    # cdf[config][t] = P(done within t turns)
+    cdf = {config: [1.0] * (HORIZON + 1) if not config else [0.0] * (HORIZON + 1) for config in CONFIGS}
+    for turns in range(1, HORIZON + 1):
+        for config in order[1:]:
+            cdf[config][turns] = sum(p * cdf[after][turns - 1] for after, p in turn_ends[config].items())
+
+    return [expected[config] for config in CONFIGS], [cdf[config][1:] for config in CONFIGS]
+
+
+def build(path: str) -> None:
+    """Generate the table and write it to ``path`` atomically."""
+    expected, cdfs = generate()
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, len(CONFIGS), HORIZON))
+            for value, cdf in zip(expected, cdfs):
+                f.write(RECORD.pack(value, *cdf))
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def seat_race(state: GameState, player: int) -> Optional[tuple]:
+    """``player``'s race configuration, or ``None`` while a token is at home or on the ring."""
+    base = player * TOKENS_PER_PLAYER
+    config = []
+    for pos in state.tokens[base:base + TOKENS_PER_PLAYER]:
+        if pos < LANE_START:
+            return None
+        if pos != FINISH:
+            config.append(pos)
+    return tuple(sorted(config))
+
+
+class Tablebase:
+    """Read-only view of a tablebase file; values are read straight from the mapping."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, horizon = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION or count != len(CONFIGS) or horizon != HORIZON:
+            raise ValueError(f"{path} is not a version {VERSION} race tablebase")
+        if len(self._map) != HEADER.size + count * RECORD.size:
+            raise ValueError(f"{path} is truncated")
+        self.path = path
+
+    def _offset(self, config: tuple) -> int:
+        return HEADER.size + INDEX[config] * RECORD.size
+
+    def expected_turns(self, config: tuple) -> float:
+        """Expected turns to finish from the start of a turn in ``config``."""
+        return struct.unpack_from("<f", self._map, self._offset(config))[0]
+
+    def cdf(self, config: tuple) -> tuple[float, ...]:
+        """``cdf[t - 1]`` = P(finished within ``t`` turns), for t = 1..HORIZON."""
+        return RECORD.unpack_from(self._map, self._offset(config))[1:]
+
+    def best_move(self, state: GameState, dice: int, moves: list[Move]) -> Optional[Move]:
+        """Move minimising the expected turns left for the seat to move, if it is racing."""
+        config = seat_race(state, state.current)
+        if config is None or not moves:
+            return None
+
+        def turns_left(move: Move) -> float:
+            after = list(config)
+            after.remove(move.old_pos)
+            if move.new_pos != FINISH:
+                after.append(move.new_pos)
+            if not after:
+                return 0.0
+            remaining = self.expected_turns(tuple(sorted(after)))
+            return remaining if dice == 6 else remaining + 1.0
+
+        return min(moves, key=turns_left)
+
+    def win_probabilities(self, state: GameState) -> Optional[list[float]]:
+        """P(win) per seat when every seat is racing, from the start of ``state.current``'s turn."""
+        configs = [seat_race(state, player) for player in range(NUM_PLAYERS)]
+        if any(config is None for config in configs):
+            return None
+        for player, config in enumerate(configs):
+            if not config:
+                return [1.0 if seat == player else 0.0 for seat in range(NUM_PLAYERS)]
+
+        cdfs = [(0.0,) + self.cdf(config) for config in configs]
+        # Seats in the order they play each round, starting with the seat to move
+        order = [(state.current + offset) % NUM_PLAYERS for offset in range(NUM_PLAYERS)]
+        wins = [0.0] * NUM_PLAYERS
+        for turns in range(1, HORIZON + 1):
+            for position, player in enumerate(order):
+                finish_now = cdfs[player][turns] - cdfs[player][turns - 1]
+                if not finish_now:
+                    continue
+                others = 1.0
+                for earlier in order[:position]:
+                    others *= 1.0 - cdfs[earlier][turns]
+                for later in order[position + 1:]:
+                    others *= 1.0 - cdfs[later][turns - 1]
+                wins[player] += finish_now * others
+        total = sum(wins)
+        return [win / total for win in wins]
+
+    def close(self) -> None:
+        self._map.close()
+
+
+_tablebase: Optional[Tablebase] = None
+_lock = threading.Lock()
+
+
+def default_path() -> str:
+    return os.getenv("LUDO_TABLEBASE") or os.path.join(
+        os.path.expanduser("~"), ".cache", "ludo", f"race_tablebase_v{VERSION}.bin"
+    )
+
+
+def get_tablebase(path: Optional[str] = None) -> Tablebase:
+    """Process-wide tablebase, mapped on first use (and built if the file is missing)."""
+    global _tablebase
+    if _tablebase is None or (path and _tablebase.path != path):
+        with _lock:
+            path = path or default_path()
+            if _tablebase is None or _tablebase.path != path:
+                if not os.path.exists(path):
+                    build(path)
+                _tablebase = Tablebase(path)
+    return _tablebase
+
+
+if __name__ == "__main__":
+    target = default_path()
+    build(target)
+    print(f"Wrote {len(CONFIGS)} race configurations to {target}")
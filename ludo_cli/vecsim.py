@@ -0,0 +1,167 @@
+"""Vectorised lockstep simulator: many games advanced one roll per step.
+
+Holds a batch of games as NumPy arrays (``tokens`` is ``N x 4 x 4``) and
+plays every active game one roll at a time with array operations. Move
+legality comes from the engine's ``TRANSITIONS`` table, so results follow
+exactly the same rules as :mod:`ludo_cli.engine`. Finished games are
+replaced by fresh ones until the requested number of games has started,
+which keeps the batch full and amortises per-step overhead.
+"""
+import time
+
+import numpy as np
+
+from .engine import (
+    FINISH,
+    ILLEGAL,
+    LANE_START,
+    NUM_PLAYERS,
+    NUM_POSITIONS,
+    PROGRESS,
+    SAFE_POSITIONS,
+    TOKENS_PER_PLAYER,
+    TRANSITIONS,
+)
+from .simulate import SimulationStats
+
+# _TRANSITIONS[player, dice, pos] and _PROGRESS[player, pos], as arrays
+_TRANSITIONS = np.array([[list(row) for row in rows] for rows in TRANSITIONS], dtype=np.uint8)
+_PROGRESS = np.array([list(row) for row in PROGRESS], dtype=np.int16)
+
+# Positions where a landing token captures opponents
+_CAPTURES = np.zeros(NUM_POSITIONS, dtype=bool)
+_CAPTURES[1:LANE_START] = True
+_CAPTURES[list(SAFE_POSITIONS)] = False
+
+VECTOR_POLICIES = ("random", "furthest")
+
+
+class VectorSimulator:
+    """``batch_size`` concurrent games sharing one NumPy random generator."""
+
+    def __init__(self, batch_size: int = 16384, seed: int | None = None, policy: str = "random"):
+        if policy not in VECTOR_POLICIES:
+            raise ValueError(f"unknown vector policy {policy!r}; choose from {', '.join(VECTOR_POLICIES)}")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.batch_size = batch_size
+        self.policy = policy
+        self.rng = np.random.default_rng(seed)
+
+        n = batch_size
+        self.tokens = np.zeros((n, NUM_PLAYERS, TOKENS_PER_PLAYER), dtype=np.uint8)
+        self.current = np.zeros(n, dtype=np.int64)
+        self.sixes = np.zeros((n, NUM_PLAYERS), dtype=np.uint8)
+        self.turns = np.zeros(n, dtype=np.int64)
+        self.captures = np.zeros((n, NUM_PLAYERS), dtype=np.int64)
+        self.active = np.zeros(n, dtype=bool)
+
+    def _reset(self, slots: np.ndarray) -> None:
+        self.tokens[slots] = 0
+        self.current[slots] = 0
+        self.sixes[slots] = 0
+        self.turns[slots] = 0
+        self.captures[slots] = 0
+        self.active[slots] = True
+
+    def _choose(self, player: np.ndarray, own: np.ndarray, legal: np.ndarray) -> np.ndarray:
+        """Index of the token each game moves (only meaningful where a move is legal)."""
+        if self.policy == "furthest":
+            score = _PROGRESS[player[:, None], own].astype(np.float64)
+        else:
+            score = self.rng.random(own.shape)
+        score[~legal] = -1.0
+        return score.argmax(axis=1)
+
+    def step(self, stats: SimulationStats) -> None:
+        """Advance every active game by one roll; finished games are added to ``stats``."""
+        games = np.flatnonzero(self.active)
+        if games.size == 0:
+            return
+        n = games.size
+        rows = np.arange(n)
+        player = self.current[games]
+        tokens = self.tokens[games]
+        own = tokens[rows, player]
+
+        # Roll and track six streaks
+        dice = self.rng.integers(1, 7, size=n)
+        sixes = self.sixes[games, player]
+        sixes = np.where(dice == 6, sixes + 1, 0)
+        penalty = sixes >= 3
+        sixes[penalty] = 0
+        self.sixes[games, player] = sixes
+
+        # Three consecutive 6s: furthest token (first of equals) goes home
+        if penalty.any():
+            furthest = own.argmax(axis=1)
+            own[rows[penalty], furthest[penalty]] = 0
+        dice = np.where(penalty, 0, dice)
+
+        # Move generation straight from the engine's transition table
+        new = _TRANSITIONS[player[:, None], dice[:, None], own]
+        legal = new != ILLEGAL
+        moved = legal.any(axis=1)
+        choice = self._choose(player, own, legal)
+
+        movers = rows[moved]
+        dest = new[movers, choice[movers]]
+        own[movers, choice[movers]] = dest
+        tokens[rows, player] = own
+
+        # Captures: opponents on a capturing destination square go home
+        capturing = movers[_CAPTURES[dest]]
+        if capturing.size:
+            targets = new[capturing, choice[capturing]]
+            hit = tokens[capturing] == targets[:, None, None]
+            hit[np.arange(capturing.size), player[capturing]] = False
+            counts = hit.sum(axis=(1, 2))
+            tokens[capturing] = np.where(hit, 0, tokens[capturing])
+            np.add.at(self.captures, (games[capturing], player[capturing]), counts)
+
+        self.tokens[games] = tokens
+        self.turns[games] += 1
+
+        # Winners: the mover has every token on the finish
+        won = moved & (tokens[rows, player] == FINISH).all(axis=1)
+        if won.any():
+            finished = games[won]
+            stats.games += finished.size
+            stats.turns += int(self.turns[finished].sum())
+            wins = np.bincount(player[won], minlength=NUM_PLAYERS)
+            caps = self.captures[finished].sum(axis=0)
+            for seat in range(NUM_PLAYERS):
+                stats.wins[seat] += int(wins[seat])
+                stats.captures[seat] += int(caps[seat])
+            self.active[finished] = False
+
+        # A used 6 earns another roll; otherwise the turn passes on
+        again = (dice == 6) & moved
+        self.current[games] = np.where(again, player, (player + 1) % NUM_PLAYERS)
+
+    def run(self, games: int) -> SimulationStats:
+        """Play ``games`` complete games, refilling finished slots as they free up."""
+        stats = SimulationStats()
+        started = time.perf_counter()
+        first = min(games, self.batch_size)
+        self.active[:] = False
+        self._reset(np.arange(first))
+        pending = games - first
+        while stats.games < games:
+            self.step(stats)
+            if pending:
+                free = np.flatnonzero(~self.active)[:pending]
+                if free.size:
+                    self._reset(free)
+                    pending -= free.size
+        stats.elapsed = time.perf_counter() - started
+        return stats
+
+
+def simulate_vectorized(games: int, seed: int | None = None, batch_size: int = 16384,
+                        policy: str = "random") -> SimulationStats:
+    if seed is None:
+        seed = int(np.random.SeedSequence().entropy % 2 ** 32)
+    stats = VectorSimulator(batch_size, seed, policy).run(games)
+    stats.seed = seed
+    return stats
@@ -0,0 +1,96 @@
+import random
+
+import pytest
+
+from ludo_cli.engine import (
+    FINISH_ENTRIES,
+    GameState,
+    NUM_PLAYERS,
+    NUM_POSITIONS,
+    START_POSITIONS,
+    TOKENS_PER_PLAYER,
+    apply_move,
+    calculate_new_position,
+    check_winner,
+    end_turn,
+    full_hash,
+    get_movable_tokens,
+    legal_moves,
+    register_roll,
+)
+
+
+# The movement rules as the original single-file game wrote them
+def old_is_movable(player, pos, dice):
+    if pos == 0:
+        return dice == 6
+    if 51 <= pos <= 57:
+        return pos + dice <= 57
+    steps_to_entry = (FINISH_ENTRIES[player] - pos) % 52
+    return dice <= steps_to_entry or 0 <= dice - steps_to_entry - 1 <= 6
+
+
+def old_new_position(player, pos, dice):
+    if pos == 0:
+        return START_POSITIONS[player]
+    if 51 <= pos <= 57:
+        target = pos + dice
+        return target if target <= 57 else pos
+    steps_to_entry = (FINISH_ENTRIES[player] - pos) % 52
+    if dice <= steps_to_entry:
+        target = pos + dice
+        return target if target <= 52 else target - 52
+    remaining_into_lane = dice - steps_to_entry - 1
+    return 51 + remaining_into_lane if remaining_into_lane <= 6 else pos
+
+
+def seat_on(player, pos):
+    """State with all of ``player``'s tokens on ``pos`` and everyone else at home."""
+    tokens = bytearray(NUM_PLAYERS * TOKENS_PER_PLAYER)
+    base = player * TOKENS_PER_PLAYER
+    tokens[base:base + TOKENS_PER_PLAYER] = bytes([pos] * TOKENS_PER_PLAYER)
+    return GameState.from_bytes(bytes(tokens) + bytes(NUM_PLAYERS) + bytes((player,)))
+
+
+@pytest.mark.parametrize("player", range(NUM_PLAYERS))
+def test_movement_matches_the_old_rules(player):
+    for dice in range(1, 7):
+        for pos in range(NUM_POSITIONS):
+            movable = old_is_movable(player, pos, dice)
+            expected = old_new_position(player, pos, dice) if movable else pos
+            assert calculate_new_position(player, pos, dice) == expected, (player, dice, pos)
+            state = seat_on(player, pos)
+            assert get_movable_tokens(state, player, dice) == (list(range(TOKENS_PER_PLAYER)) if movable else [])
+
+
+def random_game(seed, max_turns=2000):
+    """Yield the state after every roll and every move of one random game."""
+    rng = random.Random(seed)
+    state = GameState()
+    for _ in range(max_turns):
+        dice = register_roll(state, rng.randint(1, 6))
+        yield state
+        moves = legal_moves(state, dice)
+        if moves:
+            apply_move(state, rng.choice(moves))
+            yield state
+            if check_winner(state, state.current):
+                return
+        end_turn(state, dice, bool(moves))
+
+
+def assert_consistent(state):
+    assert state.hash == full_hash(state)
+    for pos in range(NUM_POSITIONS):
+        expected = sum(1 << slot for slot, token_pos in enumerate(state.tokens) if token_pos == pos)
+        assert state.occupancy[pos] == expected, pos
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_incremental_fields_and_encodings_stay_consistent(seed):
+    for state in random_game(seed):
+        assert_consistent(state)
+        for restored in (GameState.unpack(state.pack()), GameState.from_bytes(state.to_bytes())):
+            assert restored == state
+            assert restored.hash == state.hash
+            assert restored.occupancy == state.occupancy
@@ -0,0 +1,34 @@
+from ludo_cli.movelog import FIELDS, HEADER, RECORD, MoveLogWriter, iter_log, read_log
+
+RECORDS = [
+    (1, 0, 0, 6, 1, 0, 1),
+    (1, 1, 0, 4, 1, 1, 5),
+    (1, 2, 1, 0, 3, 20, 0),
+    (2, 0, 3, 6, 4, 0, 40),
+]
+
+
+def write(path, records, buffer_bytes=RECORD.size * 2):
+    with MoveLogWriter(str(path), buffer_bytes) as writer:
+        for record in records:
+            writer.record(*record)
+    return writer
+
+
+def test_records_read_back_unchanged(tmp_path):
+    path = tmp_path / "moves.mlog"
+    assert write(path, RECORDS).records == len(RECORDS)
+    assert list(iter_log(str(path), chunk_records=3)) == RECORDS
+    array = read_log(str(path))
+    assert [tuple(int(row[name]) for name in FIELDS) for row in array] == RECORDS
+
+
+def test_appending_drops_a_partial_record_and_continues_numbering(tmp_path):
+    path = tmp_path / "moves.mlog"
+    write(path, RECORDS[:2])
+    with open(path, "ab") as f:
+        f.write(RECORD.pack(*RECORDS[2])[:5])  # a run killed mid-write
+    appended = write(path, RECORDS[2:])
+    assert appended.last_game_id == 1
+    assert path.stat().st_size == HEADER.size + len(RECORDS) * RECORD.size
+    assert list(iter_log(str(path))) == RECORDS
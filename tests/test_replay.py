@@ -0,0 +1,35 @@
+from ludo_cli import models  # noqa: F401  (registers the tables)
+from ludo_cli.db import Base, get_engine, get_session_factory
+from ludo_cli.persistence import MoveRecorder
+from ludo_cli.replay import GameReplayer, replay
+
+# Red token 1 enters on a six and runs on sixes; turn 1 is a roll that moved
+# nothing, so it is not stored and breaks the streak: 1 after turn 2, 2 after turn 3
+SIXES = [(0, 0, 1), (2, 1, 7), (3, 7, 13)]
+
+
+def record_sixes(tmp_path):
+    url = f"sqlite:///{tmp_path}/replay.db"
+    Base.metadata.create_all(get_engine(url))
+    session = get_session_factory(url)()
+    with MoveRecorder.start(session) as recorder:
+        for turn, old_pos, new_pos in SIXES:
+            recorder.record(0, turn, 6, 1, old_pos, new_pos)
+    return session, recorder.game_id
+
+
+def test_streak_restarts_after_an_unstored_roll(tmp_path):
+    session, game_id = record_sixes(tmp_path)
+    state = replay(session, game_id, 3)
+    assert state.tokens[0] == 13
+    assert state.consecutive_sixes[0] == 2
+
+
+def test_stepped_seek_matches_one_off_replay(tmp_path):
+    session, game_id = record_sixes(tmp_path)
+    replayer = GameReplayer(session, game_id)
+    assert replayer.seek(1).consecutive_sixes[0] == 1
+    stepped = replayer.seek(3)
+    direct = replay(session, game_id, 3)
+    assert stepped.consecutive_sixes[0] == direct.consecutive_sixes[0] == 2
+    assert stepped.hash == direct.hash
@@ -0,0 +1,23 @@
+import pytest
+
+from ludo_cli.simulate import simulate
+
+
+def run(tmp_path, workers):
+    path = tmp_path / f"workers{workers}.mlog"
+    stats = simulate(60, seed=11, workers=workers, policy="greedy,random,heuristic,random",
+                     chunk_size=7, move_log=str(path))
+    return stats, path.read_bytes()
+
+
+def test_results_do_not_depend_on_the_worker_count(tmp_path):
+    serial, serial_log = run(tmp_path, 1)
+    parallel, parallel_log = run(tmp_path, 2)
+    assert serial.games == parallel.games == 60
+    assert (serial.turns, serial.wins, serial.captures) == (parallel.turns, parallel.wins, parallel.captures)
+    assert serial_log == parallel_log
+
+
+def test_chunk_size_must_be_positive():
+    with pytest.raises(ValueError):
+        simulate(10, seed=1, chunk_size=0)